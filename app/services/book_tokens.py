@@ -49,11 +49,6 @@ def build_book_mapping(ss: dict) -> dict:
     transport_bus_texte = ss.get("transport_bus_texte") or ss.get("transports_bus_texte") or ", ".join(_collect_line_refs(bus_auto))
     transport_taxi_texte = ss.get("transport_taxi_texte") or ss.get("transports_taxi_texte") or taxi_txt
 
-    metro_refs = _collect_line_refs(metro_auto)
-    bus_refs = _collect_line_refs(bus_auto)
-    metro_str = ", ".join(metro_refs)
-    bus_str = ", ".join(bus_refs)
-
     mapping = {
         # Adresse/Transports (Slide 4)
         "[[ADRESSE]]": adresse,
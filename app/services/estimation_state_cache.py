@@ -0,0 +1,103 @@
+"""Persistent disk cache for the Estimation quartier & transports fields."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterable, Mapping
+
+from app.services.geocode_cache import _atomic_write, _is_expired, _read_json, cache_key
+from app.services.template_tokens import QUARTIER_TRANSPORT_SESSION_KEYS
+
+
+DEFAULT_CACHE_DIR = Path(os.getenv("MFY_ESTIMATION_STATE_CACHE_DIR", "out/cache/estimation_state"))
+
+# Bump when the stored keys or their format change: older files are ignored.
+SCHEMA_VERSION = 1
+
+STATE_KEYS: tuple[str, ...] = (
+    *QUARTIER_TRANSPORT_SESSION_KEYS,
+    "metro_lines_auto",
+    "bus_lines_auto",
+    "transport_providers",
+)
+
+
+def _cache_file(address: str, radius_m: int, base_dir: Path | str | None = None) -> Path:
+    folder = Path(base_dir) if base_dir is not None else DEFAULT_CACHE_DIR
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder / f"{cache_key(f'{address}|{int(radius_m)}')}.json"
+
+
+def snapshot_state(state: Mapping[str, object]) -> dict[str, object]:
+    """Return the cached subset of ``state`` (missing keys are skipped)."""
+
+    return {key: state[key] for key in STATE_KEYS if key in state}
+
+
+def get_cached_state(
+    address: str,
+    radius_m: int,
+    *,
+    base_dir: Path | str | None = None,
+    ttl_seconds: float | None = None,
+) -> dict[str, object] | None:
+    """Return the saved fields for ``address``/``radius_m`` if still valid.
+
+    Parameters
+    ----------
+    address : str
+        Property address, normalized like the geocode cache.
+    radius_m : int
+        Search radius used for transports and POIs.
+    base_dir : Path | str | None
+        Cache root directory. Defaults to ``out/cache/estimation_state`` or the
+        ``MFY_ESTIMATION_STATE_CACHE_DIR`` environment variable.
+    ttl_seconds : float | None
+        Custom TTL in seconds. Defaults to 7 days when omitted.
+    """
+
+    ttl = ttl_seconds if ttl_seconds is not None else float(os.getenv("MFY_ESTIMATION_STATE_CACHE_TTL", 7 * 24 * 3600))
+    target = _cache_file(address, radius_m, base_dir)
+    if not target.exists():
+        return None
+
+    payload = _read_json(target)
+    if payload.get("version") != SCHEMA_VERSION:
+        return None
+    ts = payload.get("ts")
+    if ts is None or _is_expired(ts, ttl):
+        return None
+    state = payload.get("state")
+    if not isinstance(state, dict):
+        return None
+    return snapshot_state(state)
+
+
+def set_cached_state(
+    address: str,
+    radius_m: int,
+    state: Mapping[str, object],
+    *,
+    base_dir: Path | str | None = None,
+) -> None:
+    """Persist the cached subset of ``state`` using an atomic write."""
+
+    target = _cache_file(address, radius_m, base_dir)
+    payload = {
+        "version": SCHEMA_VERSION,
+        "ts": time.time(),
+        "state": snapshot_state(state),
+    }
+    serialized = json.dumps(payload, ensure_ascii=False, default=str)
+    _atomic_write(target, serialized)
+
+
+__all__: Iterable[str] = [
+    "STATE_KEYS",
+    "get_cached_state",
+    "set_cached_state",
+    "snapshot_state",
+]
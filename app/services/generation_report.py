@@ -56,6 +56,9 @@ class GenerationReport:
         if message not in self.notes:
             self.notes.append(message)
 
+    def add_notes(self, messages: Iterable[str]) -> None:
+        self._extend_unique(self.notes, messages)
+
     def merge(self, other: "GenerationReport") -> "GenerationReport":
         self._extend_unique(self.missing_tokens, other.missing_tokens)
         self._extend_unique(self.missing_shapes, other.missing_shapes)
@@ -3,15 +3,17 @@ from __future__ import annotations
 import streamlit as st
 
 from app.services.generation_report import GenerationReport
-from app.services.geocode_cache import normalize_address
+from app.services.geocode_cache import get_cached_geocode, normalize_address, set_cached_geocode
 from app.services.geocoding_fallback import geocode_address_fallback
 
 
 def ensure_geocoded(address: str, report: GenerationReport | None = None) -> tuple[float | None, float | None, str]:
-    """Return coordinates for ``address`` using session cache or fallback providers.
+    """Return coordinates for ``address`` using session/disk caches or fallback providers.
 
     The helper stores the resulting coordinates and metadata in ``st.session_state``:
     ``geo_lat``, ``geo_lon``, ``geocode_provider`` and ``geocoded_address``.
+    Successful provider lookups are also persisted on disk (``geocode_cache``)
+    so a new session does not query the providers again for the same address.
     """
 
     normalized = normalize_address(address or "")
@@ -24,7 +26,19 @@ def ensure_geocoded(address: str, report: GenerationReport | None = None) -> tup
     if session_lat is not None and session_lon is not None and session_addr == normalized:
         return float(session_lat), float(session_lon), "session_cache"
 
-    lat, lon, provider_used = geocode_address_fallback(normalized, report=report)
+    try:
+        cached = get_cached_geocode(normalized)
+    except OSError:
+        cached = None
+    if cached is not None:
+        lat, lon, provider_used = cached
+    else:
+        lat, lon, provider_used = geocode_address_fallback(normalized, report=report)
+        if lat is not None and lon is not None:
+            try:
+                set_cached_geocode(normalized, lat, lon, provider_used or "")
+            except OSError:
+                pass
     st.session_state["geo_lat"] = lat
     st.session_state["geo_lon"] = lon
     st.session_state["geocode_provider"] = provider_used or ""
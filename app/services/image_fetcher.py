@@ -6,8 +6,10 @@ import io
 import logging
 import os
 import re
+import threading
 import time
 import unicodedata
+from collections import OrderedDict
 from dataclasses import dataclass
 from mimetypes import guess_extension
 from pathlib import Path
@@ -42,6 +44,11 @@ OUTPUT_DIR = Path("out/images/poi")
 PLACEHOLDER_PATH = Path("assets/no_image.png")
 
 _LAST_RESULT: Optional["ProviderAttempt"] = None
+# LRU of get_poi_image results, placeholders included, so POIs without a photo are not re-queried.
+_RESULT_CACHE: OrderedDict[Tuple[str, Optional[str], Optional[str]], Tuple[float, str, ProviderAttempt]] = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+RESULT_TTL_SECONDS = 24 * 3600
+RESULT_CACHE_MAX_ENTRIES = 256
 
 
 @dataclass
@@ -406,8 +413,24 @@ def _cascade(poi_name: str, city: Optional[str], country: Optional[str]) -> Tupl
 
 def get_poi_image(poi_name: str, city: Optional[str] = None, country: Optional[str] = None) -> str:
     global _LAST_RESULT
+    key = (poi_name, city, country)
+    with _RESULT_CACHE_LOCK:
+        cached = _RESULT_CACHE.get(key)
+        if cached is not None:
+            ts, path, last_attempt = cached
+            if time.time() - ts < RESULT_TTL_SECONDS and os.path.exists(path):
+                _RESULT_CACHE.move_to_end(key)
+                _LAST_RESULT = last_attempt
+                return path
+            # Expired, or the file was removed: drop the entry and look again.
+            del _RESULT_CACHE[key]
     path, attempts = _cascade(poi_name, city, country)
     _LAST_RESULT = attempts[-1]
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[key] = (time.time(), path, _LAST_RESULT)
+        _RESULT_CACHE.move_to_end(key)
+        while len(_RESULT_CACHE) > RESULT_CACHE_MAX_ENTRIES:
+            _RESULT_CACHE.popitem(last=False)
     return path
 
 
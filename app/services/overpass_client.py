@@ -7,6 +7,7 @@ import time
 from typing import Any, Dict, List, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 OVERPASS_ENDPOINTS: list[str] = [
     "https://overpass-api.de/api/interpreter",
@@ -22,15 +23,29 @@ _HEADERS = {
 }
 
 _TIMEOUT = 25
+_POOL_SIZE = 8  # transports/POI lookups run a few Overpass queries in parallel
 _STATUS_TIMEOUT = 3
 _MAX_RETRIES = 2  # retries per mirror after the first attempt
 _BACKOFF_BASES = (0.6, 1.2)
 
 
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update(_HEADERS)
+    # Retries stay in query_overpass (mirror rotation), the adapter only pools connections.
+    adapter = HTTPAdapter(pool_connections=len(OVERPASS_ENDPOINTS), pool_maxsize=_POOL_SIZE)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared keep-alive session: the /status probe and the query reuse the same TLS connection.
+_SESSION = _build_session()
+
+
 def _has_available_slot(endpoint: str) -> bool:
     status_url = endpoint.replace("interpreter", "status")
     try:
-        response = requests.get(status_url, headers=_HEADERS, timeout=_STATUS_TIMEOUT)
+        response = _SESSION.get(status_url, timeout=_STATUS_TIMEOUT)
     except requests.RequestException:
         return True
     if not response.ok:
@@ -70,10 +85,9 @@ def query_overpass(query: str, label: str) -> Tuple[List[Dict[str, Any]], Dict[s
             attempts += 1
             start = time.perf_counter()
             try:
-                response = requests.post(
+                response = _SESSION.post(
                     endpoint,
                     data={"data": query},
-                    headers=_HEADERS,
                     timeout=_TIMEOUT,
                 )
             except requests.Timeout:
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterable, List
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List
 
 from app.services.generation_report import GenerationReport
 from app.services.provider_status import get_provider_status
@@ -24,25 +26,40 @@ class POIResult:
     raw: object
 
 
+@lru_cache(maxsize=4)
+def _google_service(api_key: str) -> GooglePlacesService:
+    # One client per key: its requests.Session keeps connections alive between lookups.
+    return GooglePlacesService(api_key)
+
+
+def _load_categories(loaders: Dict[str, Callable], lat: float, lon: float, radius_m: int, categories: Iterable[str]) -> Dict[str, list]:
+    wanted = [cat for cat in dict.fromkeys(categories) if cat in loaders]
+    mapping: Dict[str, list] = {}
+    if wanted:
+        # Catégories indépendantes : un aller-retour HTTPS chacune, lancées en parallèle
+        with ThreadPoolExecutor(max_workers=len(wanted)) as pool:
+            futures = {cat: pool.submit(loaders[cat], lat, lon, radius_m) for cat in wanted}
+            for cat in wanted:
+                mapping[cat] = futures[cat].result()
+    return mapping
+
+
 def _map_google(service: GooglePlacesService, lat: float, lon: float, radius_m: int, categories: Iterable[str]) -> Dict[str, List[POIResult]]:
-    mapping: Dict[str, List[GPlace]] = {}
-    for cat in categories:
-        if cat == "incontournables":
-            mapping[cat] = service.list_incontournables(lat, lon, radius_m)
-        elif cat == "spots":
-            mapping[cat] = service.list_spots(lat, lon, radius_m)
-        elif cat == "visits":
-            mapping[cat] = service.list_visits(lat, lon, radius_m)
+    loaders = {
+        "incontournables": service.list_incontournables,
+        "spots": service.list_spots,
+        "visits": service.list_visits,
+    }
+    mapping: Dict[str, List[GPlace]] = _load_categories(loaders, lat, lon, radius_m, categories)
     return {k: [_to_result(p.name, p.distance_m, "Google Places", p) for p in v] for k, v in mapping.items()}
 
 
 def _map_geoapify(service: GeoapifyPlacesService, lat: float, lon: float, radius_m: int, categories: Iterable[str]) -> Dict[str, List[POIResult]]:
-    mapping: Dict[str, List[Place]] = {}
-    for cat in categories:
-        if cat == "incontournables":
-            mapping[cat] = service.list_incontournables(lat, lon, radius_m)
-        elif cat == "spots":
-            mapping[cat] = service.list_spots(lat, lon, radius_m)
+    loaders = {
+        "incontournables": service.list_incontournables,
+        "spots": service.list_spots,
+    }
+    mapping: Dict[str, List[Place]] = _load_categories(loaders, lat, lon, radius_m, categories)
     return {k: [_to_result(p.name, p.distance_m, "Geoapify", p) for p in v] for k, v in mapping.items()}
 
 
@@ -104,7 +121,7 @@ def get_pois(
                 continue
             try:
                 g_key, _ = resolve_google_key()
-                service = GooglePlacesService(g_key)
+                service = _google_service(g_key)
                 results = _map_google(service, lat, lon, radius_m, cats)
             except Exception as exc:
                 rep.add_provider_warning(f"Google Places indisponible: {exc}")
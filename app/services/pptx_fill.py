@@ -1,6 +1,7 @@
 import logging
 import os
 import re
+import tempfile
 from typing import Dict, Optional, List, Tuple
 from urllib.parse import quote_plus
 
@@ -21,12 +22,19 @@ def insert_plot_into_pptx(template_path: str, output_path: str, image_path: str,
 
     if not os.path.exists(template_path):
         raise FileNotFoundError(f"Fichier PPTX introuvable: {template_path}")
+
+    prs = Presentation(template_path)
+    if _insert_plot_into_presentation(prs, image_path, report, strict=strict):
+        _save_presentation_atomic(prs, output_path)
+
+
+def _insert_plot_into_presentation(prs, image_path: str, report: Optional[GenerationReport] = None, *, strict: bool = False) -> bool:
+    """Add the histogram picture on the in-memory presentation; return False if the mask is missing."""
+
     if not os.path.exists(image_path):
         raise FileNotFoundError(
             f"Image d'histogramme introuvable: {image_path}. Générez le graphique avant l'export."
         )
-
-    prs = Presentation(template_path)
     if len(prs.slides) <= 5:
         raise ValueError("La présentation ne contient pas de slide 6 pour y insérer l'histogramme.")
 
@@ -53,18 +61,29 @@ def insert_plot_into_pptx(template_path: str, output_path: str, image_path: str,
         if report is not None:
             report.add_missing_shapes(["ESTIMATION_HISTO_MASK"], blocking=strict)
             report.add_note(message)
-            return
+            return False
         raise ValueError(message)
 
     left, top, width, height = target_shape.left, target_shape.top, target_shape.width, target_shape.height
+    slide.shapes.add_picture(image_path, left, top, width=width, height=height)
+    LOGGER.info("Histogramme inséré dans la slide 6 (%s)", getattr(target_shape, "name", ""))
+    return True
+
+
+def _save_presentation_atomic(prs, output_path: str) -> None:
+    """Save to a temporary file next to ``output_path`` then publish it with ``os.replace``."""
 
     output_dir = os.path.dirname(output_path)
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
-
-    slide.shapes.add_picture(image_path, left, top, width=width, height=height)
-    LOGGER.info("Histogramme inséré dans la slide 6 (%s)", getattr(target_shape, "name", ""))
-    prs.save(output_path)
+    fd, tmp_path = tempfile.mkstemp(suffix=".pptx.tmp", dir=output_dir or None)
+    os.close(fd)
+    try:
+        prs.save(tmp_path)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 def _rebuild_index(paragraph) -> tuple[str, list[tuple[int,int]]]:
     segs, parts = [], []
@@ -144,8 +163,7 @@ def replace_image_by_shape_name(prs, shape_name: str, image_path: str, report: O
                     except Exception:
                         pass
                     slide.shapes.add_picture(image_path, left, top, width=width, height=height)
-                    if report is None:
-                        print(f"[OK] Image remplacée dans {shape_name}")
+                    LOGGER.debug("Image remplacée dans %s", shape_name)
                     return True
             except Exception:
                 continue
@@ -155,7 +173,7 @@ def replace_image_by_shape_name(prs, shape_name: str, image_path: str, report: O
         report.add_missing_shapes([shape_name], blocking=strict)
         report.add_note(msg)
     else:
-        print(f"[WARN] {msg}")
+        LOGGER.warning(msg)
     return False
 
 
@@ -187,18 +205,15 @@ def generate_estimation_pptx(
                 inject_tagged_image(prs, shape_name, img_path, report, strict=strict)
             else:
                 replace_image_by_shape_name(prs, shape_name, img_path, report, strict=strict)
-    output_dir = os.path.dirname(output_path)
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
-    prs.save(output_path)
-
     leftovers = _collect_leftover_tokens(prs)
     if leftovers:
         report.add_missing_tokens(leftovers, blocking=strict)
         report.add_note("Des tokens sont restés dans le PPTX.")
 
+    # Histogramme inséré en mémoire : une seule sérialisation du PPTX
     if chart_image:
-        insert_plot_into_pptx(output_path, output_path, chart_image, report, strict=strict)
+        _insert_plot_into_presentation(prs, chart_image, report, strict=strict)
+    _save_presentation_atomic(prs, output_path)
     return report
 
 
@@ -3,11 +3,21 @@ from __future__ import annotations
 import re
 from typing import Iterable
 
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_CHUNK_SPLIT_PATTERN = re.compile(r"[.;\n]+")
+_METRO_LINE_PATTERN = re.compile(
+    r"\b(?P<rer>rer\s*[a-e])\b|"
+    r"\b(?P<tram>t\s*(?P<tram_num>\d{1,2})(?P<tram_suffix>[ab]?))\b|"
+    r"\b(?:ligne\s*)?(?P<metro>(?:3\s*bis|7\s*bis|1[0-4]|[1-9]))\b",
+    re.IGNORECASE,
+)
+_BUS_NUMBER_PATTERN = re.compile(r"\b(\d{1,3})\b")
+
 
 def _normalize_raw(raw: str) -> str:
     text = (raw or "").lower()
     text = text.replace("–", "-")
-    text = re.sub(r"\s+", " ", text)
+    text = _WHITESPACE_PATTERN.sub(" ", text)
     return text.strip()
 
 
@@ -38,19 +48,13 @@ def extract_metro_lines(raw: str) -> list[str]:
     if not normalized:
         return []
 
-    chunks = re.split(r"[.;\n]+", normalized)
-    pattern = re.compile(
-        r"\b(?P<rer>rer\s*[a-e])\b|"
-        r"\b(?P<tram>t\s*(?P<tram_num>\d{1,2})(?P<tram_suffix>[ab]?))\b|"
-        r"\b(?:ligne\s*)?(?P<metro>(?:3\s*bis|7\s*bis|1[0-4]|[1-9]))\b",
-        re.IGNORECASE,
-    )
+    chunks = _CHUNK_SPLIT_PATTERN.split(normalized)
 
     lines: list[str] = []
     for chunk in chunks:
         if not any(keyword in chunk for keyword in ("metro", "métro", "ligne", "rer", "t")):
             continue
-        for match in pattern.finditer(chunk):
+        for match in _METRO_LINE_PATTERN.finditer(chunk):
             start, end = match.span()
             if _is_duration_context(chunk, start, end):
                 continue
@@ -71,7 +75,7 @@ def extract_metro_lines(raw: str) -> list[str]:
                 lines.append(line)
 
     if not lines:
-        for match in pattern.finditer(normalized):
+        for match in _METRO_LINE_PATTERN.finditer(normalized):
             start, end = match.span()
             if _is_duration_context(normalized, start, end):
                 continue
@@ -99,12 +103,12 @@ def extract_bus_lines(raw: str) -> list[str]:
     if not normalized:
         return []
 
-    chunks = re.split(r"[.;\n]+", normalized)
+    chunks = _CHUNK_SPLIT_PATTERN.split(normalized)
     lines: list[str] = []
     for chunk in chunks:
         if not any(keyword in chunk for keyword in ("bus", "ligne", "lignes")):
             continue
-        for match in re.finditer(r"\b(\d{1,3})\b", chunk):
+        for match in _BUS_NUMBER_PATTERN.finditer(chunk):
             start, end = match.span()
             if _is_duration_context(chunk, start, end):
                 continue
@@ -114,7 +118,7 @@ def extract_bus_lines(raw: str) -> list[str]:
             lines.append(str(number))
 
     if not lines:
-        for match in re.finditer(r"\b(\d{1,3})\b", normalized):
+        for match in _BUS_NUMBER_PATTERN.finditer(normalized):
             start, end = match.span()
             if _is_duration_context(normalized, start, end):
                 continue
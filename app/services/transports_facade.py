@@ -12,6 +12,7 @@ import importlib.util
 import math
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from time import perf_counter
 from typing import Any, Dict, Iterable, List, Tuple
@@ -37,6 +38,8 @@ _TTL_SECONDS = 7 * 24 * 3600
 _CACHE_ROUNDING = 4
 _MAX_RESULTS = 4
 _DEFAULT_TAXI_DESTINATION = "Paris, Opéra"
+_DASH_PATTERN = re.compile(r"[–—−]")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
 
 
 def _round_coord(value: float, digits: int = _CACHE_ROUNDING) -> float:
@@ -64,8 +67,8 @@ def _cache_key(lat: float, lon: float, radius_m: int, mode: str, has_google: boo
 
 def normalize_name(name: str | None) -> str:
     text = (name or "").strip().lower()
-    text = re.sub(r"[–—−]", "-", text)
-    text = re.sub(r"\s+", " ", text)
+    text = _DASH_PATTERN.sub("-", text)
+    text = _WHITESPACE_PATTERN.sub(" ", text)
     for prefix in ("bus ", "ligne "):
         if text.startswith(prefix):
             text = text[len(prefix) :]
@@ -128,35 +131,90 @@ def _build_bus_query(lat: float, lon: float, radius_m: int) -> str:
     )
 
 
+def _build_transport_query(lat: float, lon: float, radius_m: int) -> str:
+    radius = max(int(radius_m), 200)
+    # Stations and bus stops in one request: two named sets, each output with its own limit.
+    return (
+        "[out:json][timeout:12];\n"
+        "(\n"
+        f"  nwr(around:{radius},{lat},{lon})[railway~\"^(station|halt)$\"];\n"
+        f"  nwr(around:{radius},{lat},{lon})[station=subway];\n"
+        f"  nwr(around:{radius},{lat},{lon})[railway=tram_stop];\n"
+        f"  nwr(around:{radius},{lat},{lon})[public_transport=station];\n"
+        ")->.stations;\n"
+        f"nwr(around:{radius},{lat},{lon})[highway=bus_stop]->.bus;\n"
+        ".stations out tags center 50;\n"
+        ".bus out tags center 50;"
+    )
+
+
+# Same tag filters as the .stations and .bus sets above.
+def _is_station(tags: Dict[str, Any]) -> bool:
+    return (
+        tags.get("railway") in {"station", "halt", "tram_stop"}
+        or tags.get("station") == "subway"
+        or tags.get("public_transport") == "station"
+    )
+
+
+def _is_bus_stop(tags: Dict[str, Any]) -> bool:
+    return tags.get("highway") == "bus_stop"
+
+
+def _split_transport_elements(
+    elements: Iterable[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    # Overpass prints an element once per set it matches: keep it once, in both lists.
+    stations: List[Dict[str, Any]] = []
+    bus_stops: List[Dict[str, Any]] = []
+    seen: set[tuple[Any, Any]] = set()
+    for element in elements:
+        ident = (element.get("type"), element.get("id"))
+        if ident[1] is not None:
+            if ident in seen:
+                continue
+            seen.add(ident)
+        tags = element.get("tags") or {}
+        if _is_station(tags):
+            stations.append(element)
+        if _is_bus_stop(tags):
+            bus_stops.append(element)
+    return stations, bus_stops
+
+
 def _query_overpass_points(query: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     return query_overpass(query, "transports_facade")
 
 
 def _finalize_entries(candidates: Iterable[Dict[str, Any]], *, prefix: str) -> list[str]:
-    labels: list[str] = []
     sorted_candidates = sorted(
         candidates,
         key=lambda item: item.get("distance_m") if item.get("distance_m") is not None else float("inf"),
     )
-    for entry in sorted_candidates:
-        name = str(entry.get("name") or entry.get("ref") or prefix).strip()
-        norm = normalize_name(name)
-        if not norm:
-            continue
-        label = f"{prefix} {name}" if prefix else name
-        distance = entry.get("distance_m")
-        distance_int: int | None
-        if distance is not None:
-            try:
-                distance_int = int(round(float(distance)))
-            except Exception:
+
+    # Generator: _dedupe_labels stops pulling once _MAX_RESULTS labels are kept,
+    # so the farther candidates are never normalized or formatted.
+    def _labels() -> Iterable[str]:
+        for entry in sorted_candidates:
+            name = str(entry.get("name") or entry.get("ref") or prefix).strip()
+            norm = normalize_name(name)
+            if not norm:
+                continue
+            label = f"{prefix} {name}" if prefix else name
+            distance = entry.get("distance_m")
+            distance_int: int | None
+            if distance is not None:
+                try:
+                    distance_int = int(round(float(distance)))
+                except Exception:
+                    distance_int = None
+            else:
                 distance_int = None
-        else:
-            distance_int = None
-        if distance_int is not None:
-            label = f"{label} ({distance_int} m)"
-        labels.append(label)
-    return _dedupe_labels(labels)
+            if distance_int is not None:
+                label = f"{label} ({distance_int} m)"
+            yield label
+
+    return _dedupe_labels(_labels())
 
 
 def _parse_overpass_elements(lat: float, lon: float, elements: Iterable[Dict[str, Any]], *, default_label: str) -> list[Dict[str, Any]]:
@@ -176,9 +234,6 @@ def _fetch_overpass_data(lat: float, lon: float, radius_m: int) -> Dict[str, Any
     warnings: list[str] = []
     start_total = perf_counter()
 
-    station_query = _build_station_query(lat, lon, radius_m)
-    bus_query = _build_bus_query(lat, lon, radius_m)
-
     def _run_query(query: str, label: str) -> tuple[list[Dict[str, Any]], Dict[str, Any]]:
         try:
             elements, dbg = _query_overpass_points(query)
@@ -191,8 +246,16 @@ def _fetch_overpass_data(lat: float, lon: float, radius_m: int) -> Dict[str, Any
         dbg.setdefault("items", len(elements))
         return elements, dbg
 
-    station_elements, station_debug = _run_query(station_query, "stations")
-    bus_elements, bus_debug = _run_query(bus_query, "bus")
+    elements, combined_debug = _run_query(_build_transport_query(lat, lon, radius_m), "stations+bus")
+    if combined_debug.get("status") == "ok":
+        station_elements, bus_elements = _split_transport_elements(elements)
+        station_debug = {**combined_debug, "label": "stations"}
+        bus_debug = {**combined_debug, "label": "bus"}
+    else:
+        # The combined request failed: retry once with the separate queries so
+        # one failing section does not take the other one down with it.
+        station_elements, station_debug = _run_query(_build_station_query(lat, lon, radius_m), "stations")
+        bus_elements, bus_debug = _run_query(_build_bus_query(lat, lon, radius_m), "bus")
 
     if station_debug.get("status") in {"timeout"} or str(station_debug.get("error", "")).startswith("http_429"):
         warnings.append("Overpass indisponible (timeout ou 429) pour les stations")
@@ -207,6 +270,7 @@ def _fetch_overpass_data(lat: float, lon: float, radius_m: int) -> Dict[str, Any
 
     duration_ms = int((perf_counter() - start_total) * 1000)
     overpass_debug = {
+        "combined": combined_debug,
         "metro": {**station_debug, "raw_items": len(station_elements), "kept": len(metro_lines)},
         "bus": {**bus_debug, "raw_items": len(bus_elements), "kept": len(bus_lines)},
         "duration_ms": duration_ms,
@@ -362,7 +426,23 @@ def _fetch_transports(lat: float, lon: float, radius_m: int, mode: str, has_goog
     provider_used: dict[str, str] = {}
     debug: dict[str, Any] = {}
 
-    overpass_data = _fetch_overpass_data(lat, lon, radius_m)
+    # Google enrichment and taxi estimate do not depend on Overpass: run them alongside it.
+    enrich = mode in {"ENRICHED", "FULL"} and has_google
+    estimate_taxi = mode != "FAST" and has_google
+    google_future = taxi_future = None
+    pool = ThreadPoolExecutor(max_workers=2) if enrich or estimate_taxi else None
+    try:
+        if enrich:
+            google_future = pool.submit(_enrich_with_google, lat, lon, radius_m, api_key=_google_api_key())
+        if estimate_taxi:
+            taxi_future = pool.submit(_estimate_taxi_time, lat, lon, api_key=_google_api_key())
+        overpass_data = _fetch_overpass_data(lat, lon, radius_m)
+        google_data = google_future.result() if google_future is not None else {}
+        taxi_estimate = taxi_future.result() if taxi_future is not None else []
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False)
+
     metro_lines = list(overpass_data.get("metro_lines", []))
     bus_lines = list(overpass_data.get("bus_lines", []))
     warnings.extend(overpass_data.get("warnings", []))
@@ -374,8 +454,7 @@ def _fetch_transports(lat: float, lon: float, radius_m: int, mode: str, has_goog
     raw_metro = raw_counts.get("metro", 0)
     raw_bus = raw_counts.get("bus", 0)
 
-    if mode in {"ENRICHED", "FULL"} and has_google:
-        google_data = _enrich_with_google(lat, lon, radius_m, api_key=_google_api_key())
+    if enrich:
         warnings.extend(google_data.get("warnings", []))
         debug["google"] = google_data.get("debug", {})
         if google_data.get("metro_lines"):
@@ -402,7 +481,7 @@ def _fetch_transports(lat: float, lon: float, radius_m: int, mode: str, has_goog
     if mode == "FAST":
         taxis = ["Non calculé (mode FAST)"]
     elif has_google:
-        taxis = _estimate_taxi_time(lat, lon, api_key=_google_api_key()) or []
+        taxis = taxi_estimate or []
 
     return {
         "metro_lines": metro_lines[:_MAX_RESULTS],
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import os
+import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import streamlit as st
@@ -13,7 +15,6 @@ from app.services.book_pdf import build_book_pdf
 from app.services.book_tokens import build_book_mapping
 from app.services.generation_report import GenerationReport
 from app.services.geocoding_fallback import geocode_address_fallback
-from app.services.map_image import build_static_map
 from app.services.poi import fetch_transports, list_metro_lines, list_bus_lines
 from app.services.pptx_requirements import get_book_detectors, get_book_requirements
 from app.services.pptx_fill import generate_book_pptx
@@ -21,7 +22,9 @@ from app.services.template_catalog import TemplateItem, list_effective_templates
 from app.services.template_validation import validate_pptx_template
 
 from .utils import (
+    _next_free_filename,
     _sanitize_filename,
+    _static_map_path,
     render_generation_report,
     render_template_validation,
 )
@@ -124,20 +127,15 @@ def render(config: dict) -> None:
         if uploaded_book:
             book_upload_dir.mkdir(parents=True, exist_ok=True)
             saved = 0
+            with os.scandir(book_upload_dir) as entries:
+                existing_names = {entry.name for entry in entries}
             for up in uploaded_book:
-                safe_name = _sanitize_filename(up.name, "pptx")
+                safe_name = _next_free_filename(_sanitize_filename(up.name, "pptx"), existing_names)
+                existing_names.add(safe_name)
                 dst = book_upload_dir / safe_name
-                if dst.exists():
-                    base = dst.stem
-                    ext = dst.suffix
-                    i = 2
-                    candidate = book_upload_dir / f"{base} ({i}){ext}"
-                    while candidate.exists():
-                        i += 1
-                        candidate = book_upload_dir / f"{base} ({i}){ext}"
-                    dst = candidate
+                up.seek(0)
                 with open(dst, "wb") as f:
-                    f.write(up.getbuffer())
+                    shutil.copyfileobj(up, f, length=1 << 20)
                 saved += 1
             st.success(f"{saved} template(s) ajouté(s).")
             st.toast("Rafraîchissez la sélection ci-dessus pour utiliser les templates ajoutés.")
@@ -197,9 +195,14 @@ def render(config: dict) -> None:
         if lat is not None:
             try:
                 radius = st.session_state.get("radius_m", 1200)
-                taxi_items, taxi_debug = fetch_transports(lat, lon, radius_m=radius)
-                metro_items, metro_debug = list_metro_lines(lat, lon, radius_m=radius)
-                bus_items, bus_debug = list_bus_lines(lat, lon, radius_m=radius)
+                # Trois requêtes Overpass indépendantes : on les lance en parallèle
+                with ThreadPoolExecutor(max_workers=3) as pool:
+                    taxi_future = pool.submit(fetch_transports, lat, lon, radius_m=radius)
+                    metro_future = pool.submit(list_metro_lines, lat, lon, radius_m=radius)
+                    bus_future = pool.submit(list_bus_lines, lat, lon, radius_m=radius)
+                    taxi_items, taxi_debug = taxi_future.result()
+                    metro_items, metro_debug = metro_future.result()
+                    bus_items, bus_debug = bus_future.result()
                 st.session_state["q_tx"] = _format_taxi_summary(taxi_items)
                 st.session_state["metro_lines_auto"] = metro_items
                 st.session_state["bus_lines_auto"] = bus_items
@@ -246,8 +249,9 @@ def render(config: dict) -> None:
                     continue
                 fd, path = tempfile.mkstemp(suffix=os.path.splitext(up.name)[1])
                 os.close(fd)
+                up.seek(0)
                 with open(path, "wb") as f:
-                    f.write(up.getbuffer())
+                    shutil.copyfileobj(up, f, length=1 << 20)
                 st.session_state[key] = path
             imgs_exist = all(st.session_state.get(k) for k in img_keys)
             if imgs_exist:
@@ -274,7 +278,7 @@ def render(config: dict) -> None:
     lat = st.session_state.get("geo_lat")
     lon = st.session_state.get("geo_lon")
     if lat and lon:
-        map_path = build_static_map(lat, lon, pixel_radius=60, size=(900, 900))
+        map_path = _static_map_path(lat, lon, pixel_radius=60, size=(900, 900))
         image_by_shape["MAP_BOOK_MASK"] = map_path
     if st.session_state.get("book_img_porte"):
         image_by_shape["PORTE_ENTREE_MASK"] = st.session_state["book_img_porte"]
@@ -321,7 +325,7 @@ def render(config: dict) -> None:
             else:
                 st.success(f"OK: {pptx_out}")
                 with open(pptx_out, "rb") as f:
-                    st.download_button("Télécharger le PPTX", data=f.read(), file_name=os.path.basename(pptx_out))
+                    st.download_button("Télécharger le PPTX", data=f, file_name=os.path.basename(pptx_out))
             render_generation_report(report, strict=strict_mode)
     with col2:
         if st.button("Générer le Book (PDF simplifié)"):
@@ -335,4 +339,4 @@ def render(config: dict) -> None:
             )
             st.success(f"OK: {pdf_out}")
             with open(pdf_out, "rb") as f:
-                st.download_button("Télécharger le PDF", data=f.read(), file_name=os.path.basename(pdf_out))
+                st.download_button("Télécharger le PDF", data=f, file_name=os.path.basename(pdf_out))
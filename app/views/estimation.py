@@ -1,20 +1,23 @@
+import logging
 import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from time import perf_counter
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional
 
 import streamlit as st
 from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
+from app.services.estimation_state_cache import get_cached_state, set_cached_state, snapshot_state
 from app.services.generation_report import GenerationReport
 from app.services.geo_helpers import ensure_geocoded
 from app.services.geocode_cache import normalize_address
-from app.services.map_image import build_static_map
-from app.services.plots import build_estimation_histo
 from app.services.poi_facade import POIResult, get_pois
 from app.services.provider_status import get_provider_status
 from app.services.quartier_enricher import enrich_quartier_and_transports
-from app.services.pptx_fill import generate_estimation_pptx
 from app.services.pptx_requirements import (
     get_estimation_detectors,
     get_estimation_requirements,
@@ -24,7 +27,11 @@ from app.services.template_tokens import (
     build_quartier_transport_tokens_mapping,
     migrate_quartier_transport_session,
 )
-from app.services.template_catalog import TemplateItem, list_effective_estimation_templates
+from app.services.template_catalog import (
+    TemplateItem,
+    list_env_estimation_templates,
+    list_repo_estimation_templates,
+)
 from app.services import template_roots
 from app.services.transports_compact import build_compact_transport_texts
 from app.services.transports_facade import get_transports
@@ -35,21 +42,81 @@ from app.services.revenue import (
     build_revenue_token_mapping,
     compute_revenue,
 )
-from app.services.template_catalog import list_effective_estimation_templates
-from app.services.template_validation import validate_pptx_template
 from services.image_uploads import save_uploaded_image
 from services.wiki_images import ImageCandidate, WikiImageService
 
+if TYPE_CHECKING:
+    from app.services.template_validation import ValidationResult
+
 from .utils import (
+    _image_bytes,
+    _next_free_filename,
     _sanitize_filename,
+    _static_map_path,
     apply_pending_fields,
     render_generation_report,
     render_template_validation,
 )
 
 
+LOGGER = logging.getLogger(__name__)
+
 DEFAULT_RADIUS_M = 300
 
+_BASE_PRICE_KEYS = (
+    "base_nightly_price",
+    "price_per_night",
+    "base_price",
+    "price_base",
+    "rn_prix",
+)
+
+# Tokens copiés tels quels depuis la session (Slides 4 et 5).
+_TEXT_TOKEN_KEYS = (
+    ("[[INCONTOURNABLE_1_NOM]]", "i1"),
+    ("[[INCONTOURNABLE_2_NOM]]", "i2"),
+    ("[[INCONTOURNABLE_3_NOM]]", "i3"),
+    ("[[SPOT_1_NOM]]", "s1"),
+    ("[[SPOT_2_NOM]]", "s2"),
+    ("[[VISITE_1_NOM]]", "v1"),
+    ("[[VISITE_2_NOM]]", "v2"),
+    ("[[MODE_CHAUFFAGE]]", "bien_chauffage"),
+    ("[[POINT_FORT_1]]", "pf1"),
+    ("[[POINT_FORT_2]]", "pf2"),
+    ("[[POINT_FORT_3]]", "pf3"),
+    ("[[CHALLENGE_1]]", "ch1"),
+    ("[[CHALLENGE_2]]", "ch2"),
+    ("[[CHALLENGE_3]]", "ch3"),
+)
+
+_INT_TOKEN_KEYS = (
+    ("[[NB_PIECES]]", "bien_pieces"),
+    ("[[NB_SDB]]", "bien_sdb"),
+    ("[[NB_COUCHAGES]]", "bien_couchages"),
+)
+
+_ESTIMATION_REQUIREMENTS = {
+    estimation_type: (
+        frozenset(get_estimation_requirements(estimation_type)),
+        get_estimation_detectors(estimation_type),
+    )
+    for estimation_type in ("CD", "MD")
+}
+
+_POI_CATEGORIES = ("incontournables", "spots", "visits")
+
+# Champs texte remplis par l'enrichissement (le taxi a une valeur par défaut).
+_STATE_TEXT_KEYS = ("quartier_intro", "transport_metro_texte", "transport_bus_texte")
+
+_GEOCODE_RESET = {"geo_lat": None, "geo_lon": None, "geocode_provider": ""}
+
+_PROVIDER_ORDER = (
+    ("Google Places", "Google"),
+    ("Geoapify", "Geoapify"),
+    ("OpenTripMap", "OTM"),
+    ("Wikimedia", "Wiki"),
+)
+
 
 def normalize_estimation_type(label: str) -> str:
     if "MD" in (label or "").upper():
@@ -64,41 +131,193 @@ def should_generate_estimation_histo(estimation_type: str) -> bool:
 def generate_estimation_histo_if_needed(
     estimation_type: str,
     base_price_value: float,
-    build_func=build_estimation_histo,
+    build_func=None,
 ):
     if not should_generate_estimation_histo(estimation_type):
         return None
+    if build_func is None:
+        return _estimation_histo_path(base_price_value)
     return build_func(base_price_value)
 
 
+# Un seul PNG (out/plots/estimation_histo.png) : on retient le prix qu'il
+# représente pour ne le redessiner que si le prix ou le fichier a changé.
+_HISTO_LOCK = threading.Lock()
+_rendered_histo: dict[str, Any] = {}
+
+
+def _file_mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _estimation_histo_path(base_price_value: float) -> str:
+    from app.services.plots import build_estimation_histo
+
+    base_price = round(float(base_price_value), 2)
+    with _HISTO_LOCK:
+        path = _rendered_histo.get("path")
+        if (
+            path
+            and _rendered_histo.get("price") == base_price
+            and _file_mtime_ns(path) == _rendered_histo.get("mtime_ns")
+        ):
+            return path
+        path = build_estimation_histo(base_price)
+        _rendered_histo.update(price=base_price, path=path, mtime_ns=_file_mtime_ns(path))
+        return path
+
+
+@st.fragment
+def _estimation_histo_panel(
+    estimation_type: str, base_price_value: Optional[float], histo_error: Optional[str]
+) -> None:
+    # Fragment: the "(Re)générer" button only reruns this panel, not the whole view.
+    # The base price is resolved once by render(); price widgets live outside the
+    # fragment, so any change to them triggers a full rerun with fresh arguments.
+    ss = st.session_state
+    histo_col_btn, histo_col_preview = st.columns([1, 3])
+
+    with histo_col_btn:
+        regen_clicked = st.button(
+            "(Re)générer graphique",
+            key="regen_estimation_histo",
+            disabled=base_price_value is None,
+        )
+        if histo_error:
+            st.error(histo_error)
+        if regen_clicked and base_price_value is not None:
+            try:
+                plot_path = generate_estimation_histo_if_needed(estimation_type, base_price_value)
+                ss["estimation_histo_png"] = plot_path
+                st.success("Graphique mis à jour.")
+            except Exception as exc:
+                st.error(f"Échec de la génération du graphique: {exc}")
+
+    # The session path was checked on disk when the histogram was built.
+    preview_path = ss.get("estimation_histo_png")
+
+    with histo_col_preview:
+        if preview_path:
+            try:
+                st.image(_image_bytes(preview_path), caption="Évo du prix/nuitée")
+            except Exception:
+                ss.pop("estimation_histo_png", None)
+                preview_path = None
+        if not preview_path and not histo_error:
+            st.caption("Graphique non généré pour le moment.")
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_repo_estimation_templates(estimation_type: str, dir_mtime_ns: int) -> list[TemplateItem]:
+    return list_repo_estimation_templates(estimation_type)
+
+
+def _list_estimation_templates(estimation_type: str) -> list[TemplateItem]:
+    # Same priority as list_effective_estimation_templates, but the repo folder is
+    # only listed again when its mtime changes (file added, removed or renamed).
+    tpl_dir = template_roots.get_estimation_templates_dir(estimation_type)
+    try:
+        dir_mtime_ns = tpl_dir.stat().st_mtime_ns
+    except OSError:
+        repo_items = list_repo_estimation_templates(estimation_type)
+    else:
+        repo_items = _cached_repo_estimation_templates(estimation_type, dir_mtime_ns)
+    return repo_items or list_env_estimation_templates(estimation_type)
+
+
+@st.fragment(run_every=1)
+def _image_download_progress(slot: str) -> None:
+    # Polls the background download without blocking the page; once the file is
+    # ready a full rerun lets the visit column pick it up.
+    pending = st.session_state.get(f"{slot}_download_future")
+    if pending is not None and pending[0].done():
+        st.rerun()
+    st.caption("Téléchargement de l'image en cours…")
+
+
+@st.cache_resource
+def _download_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4)
+
+
+def _submit_with_script_ctx(fn, *args) -> Future:
+    # Dedicated thread rather than the shared pool: the ScriptRunContext must be
+    # attached before the thread starts, so st.cache_data works inside fn.
+    future: Future = Future()
+
+    def _run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    thread = threading.Thread(target=_run, daemon=True)
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+    return future
+
+
+@st.cache_resource
+def _wiki_service() -> WikiImageService:
+    # One requests.Session shared by searches and downloads keeps connections alive.
+    return WikiImageService()
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=64)
+def _cached_wiki_candidates(title: str, limit: int = 5) -> list[dict]:
+    candidates = _wiki_service().candidates(title=title, city=None, country=None, limit=limit)
+    return [candidate.to_dict() for candidate in candidates]
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_validate_estimation_template(
+    template_path: str,
+    mtime: float,
+    mapping_keys: frozenset[str],
+    estimation_type: str,
+) -> "ValidationResult":
+    # ``mtime`` is only part of the cache key: editing the template invalidates it.
+    from app.services.template_validation import validate_pptx_template
+
+    requirements, detectors = _ESTIMATION_REQUIREMENTS[normalize_estimation_type(estimation_type)]
+    return validate_pptx_template(
+        template_path,
+        set(mapping_keys),
+        requirements,
+        requirement_detectors=detectors,
+    )
+
+
 def _restore_candidates(key: str) -> list[ImageCandidate]:
-    stored = st.session_state.get(key, [])
+    stored = st.session_state.get(key) or []
+    if all(isinstance(item, ImageCandidate) for item in stored):
+        return stored
+    # Legacy sessions stored dicts: convert once and keep the objects.
     candidates: list[ImageCandidate] = []
     for item in stored:
         if isinstance(item, ImageCandidate):
             candidates.append(item)
         elif isinstance(item, dict):
             candidates.append(ImageCandidate.from_dict(item))
+    st.session_state[key] = candidates
     return candidates
 
 
 def _resolve_base_nightly_price() -> float:
-    keys = [
-        "base_nightly_price",
-        "price_per_night",
-        "base_price",
-        "price_base",
-        "rn_prix",
-    ]
-    for key in keys:
-        if key in st.session_state:
-            raw = st.session_state.get(key)
-            if raw in (None, ""):
-                continue
-            try:
-                return float(raw)
-            except (TypeError, ValueError):
-                continue
+    state = st.session_state
+    for key in _BASE_PRICE_KEYS:
+        raw = state.get(key)
+        if raw is None or raw == "":
+            continue
+        try:
+            return float(raw)
+        except (TypeError, ValueError):
+            continue
     raise ValueError("Paramètre 'base_nightly_price' introuvable dans l'état de l'application.")
 
 def _collect_line_refs(items: list, limit: Optional[int] = None) -> list[str]:
@@ -135,6 +354,93 @@ def _format_line_labels(items: list, prefix: str) -> str:
     return ", ".join(labels)
 
 
+def _build_estimation_mapping(
+    state: Mapping[str, Any],
+    scenario_prices: tuple[float, float, float],
+    revenue_mapping: Mapping[str, str],
+) -> dict[str, str]:
+    transport_values = {"quartier_intro": state.get("quartier_intro", "")}
+    transport_values.update(
+        build_compact_transport_texts(
+            state.get("transport_metro_texte", ""),
+            state.get("transport_bus_texte", ""),
+            state.get("transport_taxi_texte", ""),
+        )
+    )
+    prix_pess, prix_cible, prix_opt = scenario_prices
+    mapping = {
+        # Slide 4
+        "[[ADRESSE]]": state.get("bien_addr", ""),
+        **build_quartier_transport_tokens_mapping(transport_values),
+    }
+    mapping.update({token: state.get(key, "") for token, key in _TEXT_TOKEN_KEYS})
+    # Slide 5 (valeurs numériques)
+    mapping["[[NB_SURFACE]]"] = "%.0f" % state.get("bien_surface", 0)
+    mapping.update({token: "%d" % int(state.get(key, 0)) for token, key in _INT_TOKEN_KEYS})
+    # Slide 6
+    mapping["[[PRIX_NUIT]]"] = "%.0f €" % state.get("rn_prix", 0)
+    mapping["[[TAUX_OCC]]"] = f"{state.get('rn_occ', 0)} %"
+    mapping["[[PRIX_PESSIMISTE]]"] = "%.0f €" % prix_pess
+    mapping["[[PRIX_CIBLE]]"] = "%.0f €" % prix_cible
+    mapping["[[PRIX_OPTIMISTE]]"] = "%.0f €" % prix_opt
+    mapping.update(revenue_mapping)
+    return mapping
+
+
+# Les tokens du mapping ne dépendent pas des valeurs saisies.
+_MAPPING_TOKENS = frozenset(_build_estimation_mapping({}, (0.0, 0.0, 0.0), build_revenue_token_mapping({})))
+
+
+def _poi_cache_key(lat: float | None, lon: float | None, radius_m: int) -> tuple[float, float, int] | None:
+    if lat is None or lon is None:
+        return None
+    return round(float(lat), 5), round(float(lon), 5), int(radius_m)
+
+
+class _EmptyPOILookup(Exception):
+    """Raised inside ``_cached_pois`` so that empty lookups are not memoised."""
+
+    def __init__(self, results: dict[str, list[POIResult]]) -> None:
+        super().__init__("Aucun POI")
+        self.results = results
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=64)
+def _cached_pois(lat: float, lon: float, radius_m: int, _report: GenerationReport) -> dict[str, list[POIResult]]:
+    # Only the results are cached: ``_report`` (not hashed) is filled on a real
+    # lookup, so a cache hit does not replay that lookup's provider warnings.
+    results = get_pois(lat, lon, radius_m, categories=_POI_CATEGORIES, report=_report)
+    if not any(results.values()):
+        raise _EmptyPOILookup(results)
+    return results
+
+
+def _load_pois(poi_key: tuple[float, float, int]) -> tuple[dict[str, list[POIResult]], GenerationReport]:
+    """Return POIs for a ``_poi_cache_key`` and the provider report of this call (empty on a cache hit)."""
+    report = GenerationReport()
+    try:
+        return _cached_pois(*poi_key, report), report
+    except _EmptyPOILookup as empty:
+        return empty.results, report
+
+
+def _place_choices(items: list[POIResult]) -> tuple[list[str], dict[str, list[int]]]:
+    labels: list[str] = []
+    name_to_indices: dict[str, list[int]] = {}
+    for idx, place in enumerate(items):
+        labels.append(f"{place.name} ({round(place.distance_m or 0)} m)")
+        name_to_indices.setdefault(place.name, []).append(idx)
+    return labels, name_to_indices
+
+
+def _resolve_poi_provider(results: dict[str, list[POIResult]]) -> str:
+    for bucket in _POI_CATEGORIES:
+        items = results.get(bucket) or []
+        if items:
+            return items[0].provider
+    return ""
+
+
 def _display_transport_caption(*debug_values: dict | None) -> None:
     pairs = [(label, dbg) for label, dbg in zip(["taxi", "metro", "bus"], debug_values) if isinstance(dbg, dict)]
     if not pairs:
@@ -142,44 +448,40 @@ def _display_transport_caption(*debug_values: dict | None) -> None:
     mirror = None
     parts: list[str] = []
     for label, dbg in pairs:
-        if not mirror and dbg.get("mirror"):
-            mirror = dbg.get("mirror")
-        segment: list[str] = [label]
-        if dbg.get("duration_ms") is not None:
-            segment.append(f"{int(dbg['duration_ms'])}ms")
-        if dbg.get("items") is not None:
-            segment.append(f"{int(dbg['items'])} items")
+        dbg_mirror = dbg.get("mirror")
+        duration_ms = dbg.get("duration_ms")
+        items = dbg.get("items")
         status = dbg.get("status")
+        if not mirror and dbg_mirror:
+            mirror = dbg_mirror
+        segment = label
+        if duration_ms is not None:
+            segment = f"{segment} {int(duration_ms)}ms"
+        if items is not None:
+            segment = f"{segment} {int(items)} items"
         if status and status != "ok":
-            segment.append(status)
-        parts.append(" ".join(segment))
+            segment = f"{segment} {status}"
+        parts.append(segment)
     caption_parts: list[str] = []
     if mirror:
         caption_parts.append(f"mirror={mirror}")
     caption_parts.extend(parts)
     try:
-            st.caption("Transports: " + " | ".join(caption_parts))
+        st.caption("Transports: " + " | ".join(caption_parts))
     except Exception:
         pass
 
 
 def _compact_provider_status() -> str:
     status = get_provider_status()
-    labels = []
-    order = [
-        ("Google Places", "Google"),
-        ("Geoapify", "Geoapify"),
-        ("OpenTripMap", "OTM"),
-        ("Wikimedia", "Wiki"),
-    ]
-    for key, short in order:
-        entry = status.get(key, {})
-        emoji = "✅" if entry.get("enabled") else "❌"
-        labels.append(f"{short} {emoji}")
-    return " / ".join(labels)
+    return " / ".join(
+        f"{short} {'✅' if status.get(key, {}).get('enabled') else '❌'}"
+        for key, short in _PROVIDER_ORDER
+    )
 
 
 def render(config):
+    ss = st.session_state
     TPL_DIR = config['TPL_DIR']
     EST_TPL_DIR = config['EST_TPL_DIR']
     OUT_DIR = config['OUT_DIR']
@@ -191,20 +493,20 @@ def render(config):
         key="estimation_type_ui",
     )
     estimation_type = normalize_estimation_type(estimation_choice)
-    st.session_state["estimation_type"] = estimation_type
+    ss["estimation_type"] = estimation_type
 
     # ---------- APPLY PENDING PREFILL BEFORE WIDGETS ----------
-    if "__prefill" in st.session_state and isinstance(st.session_state["__prefill"], dict):
-        # apply and pop so we don't loop
-        for k, v in st.session_state["__prefill"].items():
-            st.session_state[k] = v
-        st.session_state.pop("__prefill", None)
+    prefill = ss.get("__prefill")
+    if isinstance(prefill, dict):
+        # apply in one update and pop so we don't loop
+        ss.update(prefill)
+        ss.pop("__prefill", None)
 
     # ---- Templates Estimation (PPTX) ----
     st.subheader("Templates Estimation (PPTX)")
     st.caption(f"Templates: Git / estimation/{estimation_type.lower()}")
 
-    templates = list_effective_estimation_templates(estimation_type)
+    templates = _list_estimation_templates(estimation_type)
     selected_template: TemplateItem | None = None
 
     repo_templates = [tpl for tpl in templates if tpl.source == "repo"]
@@ -236,23 +538,24 @@ def render(config):
             key="up_est",
         )
         est_upload_dir = Path(EST_TPL_DIR)
+        # A single directory scan serves both the collision check and the uploaded list.
+        try:
+            with os.scandir(est_upload_dir) as entries:
+                upload_dir_files = {entry.name: entry.is_file() for entry in entries}
+        except FileNotFoundError:
+            upload_dir_files = {}
         if uploaded_tpls:
             est_upload_dir.mkdir(parents=True, exist_ok=True)
             saved = 0
+            existing_names = set(upload_dir_files)
             for up in uploaded_tpls:
-                safe_name = _sanitize_filename(up.name, "pptx")
+                safe_name = _next_free_filename(_sanitize_filename(up.name, "pptx"), existing_names)
+                existing_names.add(safe_name)
                 dst = est_upload_dir / safe_name
-                if dst.exists():
-                    base = dst.stem
-                    ext = dst.suffix
-                    i = 2
-                    candidate = est_upload_dir / f"{base} ({i}){ext}"
-                    while candidate.exists():
-                        i += 1
-                        candidate = est_upload_dir / f"{base} ({i}){ext}"
-                    dst = candidate
+                up.seek(0)
                 with open(dst, "wb") as f:
-                    f.write(up.getbuffer())
+                    shutil.copyfileobj(up, f, length=1 << 20)
+                upload_dir_files[safe_name] = True
                 saved += 1
             st.success(f"{saved} template(s) ajouté(s).")
             st.toast("Rafraîchissez la sélection ci-dessus pour utiliser les templates ajoutés.")
@@ -260,9 +563,9 @@ def render(config):
         upload_items: list[TemplateItem] = []
         if est_upload_dir.resolve() != template_roots.ESTIMATION_TPL_DIR.resolve():
             upload_items = [
-                TemplateItem(label=p.name, source="uploaded", path=p)
-                for p in est_upload_dir.iterdir()
-                if p.is_file() and p.suffix.lower() == ".pptx"
+                TemplateItem(label=name, source="uploaded", path=est_upload_dir / name)
+                for name, is_file in upload_dir_files.items()
+                if is_file and name.lower().endswith(".pptx")
             ]
         if upload_items:
             use_uploaded = st.checkbox(
@@ -282,49 +585,43 @@ def render(config):
     geocode_debug = st.checkbox("Debug géocodage", key="geocode_debug_toggle")
 
     def _geocode_main_address(show_debug: bool = False):
-        addr_raw = st.session_state.get("bien_addr", "") or ""
+        addr_raw = ss.get("bien_addr", "") or ""
         addr = addr_raw.strip()
         normalized_addr = normalize_address(addr)
-        st.session_state["geocode_address_norm"] = normalized_addr
+        ss["geocode_address_norm"] = normalized_addr
         perf_geocode: dict[str, object] = {}
 
         if not addr:
             st.error("Adresse manquante pour le géocodage.")
-            st.session_state["geo_lat"] = None
-            st.session_state["geo_lon"] = None
-            st.session_state["geocode_provider"] = ""
+            ss.update(_GEOCODE_RESET)
             return None, None, "", perf_geocode
 
         cache_hit = (
-            st.session_state.get("geo_lat") is not None
-            and st.session_state.get("geo_lon") is not None
-            and st.session_state.get("geocoded_address") == normalized_addr
+            ss.get("geo_lat") is not None
+            and ss.get("geo_lon") is not None
+            and ss.get("geocoded_address") == normalized_addr
         )
 
         last_warning_before = len(run_report.provider_warnings)
         start = perf_counter()
         try:
             if cache_hit:
-                lat, lon, provider_used = ensure_geocoded(addr, report=run_report)
+                lat, lon, provider_used = ensure_geocoded(normalized_addr, report=run_report)
             else:
                 with st.spinner("Géocodage…"):
-                    lat, lon, provider_used = ensure_geocoded(addr, report=run_report)
+                    lat, lon, provider_used = ensure_geocoded(normalized_addr, report=run_report)
         except ValueError as exc:
             st.error(str(exc))
-            st.session_state["geo_lat"] = None
-            st.session_state["geo_lon"] = None
-            st.session_state["geocode_provider"] = ""
+            ss.update(_GEOCODE_RESET)
             return None, None, "", perf_geocode
         except Exception as exc:
             st.error(f"Géocodage impossible: {exc}")
-            st.session_state["geo_lat"] = None
-            st.session_state["geo_lon"] = None
-            st.session_state["geocode_provider"] = ""
+            ss.update(_GEOCODE_RESET)
             return None, None, "", perf_geocode
         duration = perf_counter() - start
 
         last_warning = run_report.provider_warnings[-1] if run_report.provider_warnings else None
-        provider_label = st.session_state.get("geocode_provider") or provider_used or "Nominatim"
+        provider_label = ss.get("geocode_provider") or provider_used or "Nominatim"
         if lat is None or lon is None:
             if last_warning and len(run_report.provider_warnings) > last_warning_before:
                 st.error(f"Géocodage échoué: {last_warning}")
@@ -354,18 +651,18 @@ def render(config):
         return lat, lon, provider_label, perf_geocode
 
     def _auto_geocode_or_stop(action_label: str, *, stop_on_error: bool = True) -> tuple[float | None, float | None, str]:
-        addr_raw = (st.session_state.get("bien_addr", "") or "").strip()
+        addr_raw = (ss.get("bien_addr", "") or "").strip()
         normalized_addr = normalize_address(addr_raw)
         needs_spinner = (
-            st.session_state.get("geo_lat") is None
-            or st.session_state.get("geo_lon") is None
-            or st.session_state.get("geocoded_address") != normalized_addr
+            ss.get("geo_lat") is None
+            or ss.get("geo_lon") is None
+            or ss.get("geocoded_address") != normalized_addr
         )
         try:
             if needs_spinner:
                 with st.spinner("Géocodage automatique…"):
-                    return ensure_geocoded(addr_raw, report=run_report)
-            return ensure_geocoded(addr_raw, report=run_report)
+                    return ensure_geocoded(normalized_addr, report=run_report)
+            return ensure_geocoded(normalized_addr, report=run_report)
         except ValueError as exc:
             st.error(str(exc))
         except Exception as exc:
@@ -376,36 +673,71 @@ def render(config):
 
     # ---- Quartier & transports (Slide 4) ----
     st.subheader("Quartier & Transports (Slide 4)")
-    radius_default_raw = st.session_state.get("radius_m", DEFAULT_RADIUS_M)
-    try:
-        radius_default = int(radius_default_raw)
-    except (TypeError, ValueError):
-        radius_default = DEFAULT_RADIUS_M
-        st.session_state["radius_m"] = DEFAULT_RADIUS_M
-    st.slider(
+    radius_m = st.slider(
         "Rayon (m)",
         min_value=300,
         max_value=3000,
-        value=radius_default,
+        value=ss.get("radius_m", DEFAULT_RADIUS_M),
         step=100,
         key="radius_m",
         help="Distance utilisée pour les lieux et transports.",
     )
-    migrate_quartier_transport_session(st.session_state)
+    # Les anciennes clés transports_* ne sont plus écrites : une migration par session suffit.
+    if not ss.get("_transport_keys_migrated"):
+        migrate_quartier_transport_session(ss)
+        ss["_transport_keys_migrated"] = True
     for key in QUARTIER_TRANSPORT_SESSION_KEYS:
-        st.session_state.setdefault(key, "")
-    if not st.session_state.get("transport_taxi_texte"):
-        st.session_state["transport_taxi_texte"] = "Stations de taxi"
+        ss.setdefault(key, "")
+    if not ss.get("transport_taxi_texte"):
+        ss["transport_taxi_texte"] = "Stations de taxi"
+
+    # Bien déjà enrichi : recharge quartier/transports depuis le disque au lieu
+    # de relancer LLM + Overpass. Une seule lecture par (adresse, rayon) : un
+    # champ vidé ensuite par l'utilisateur reste vide.
+    state_address = normalize_address(ss.get("bien_addr", "") or "")
+    state_key = (state_address, int(radius_m))
+    if state_address and ss.get("_est_state_restored_key") != state_key:
+        ss["_est_state_restored_key"] = state_key
+        if not any(ss.get(key) for key in _STATE_TEXT_KEYS) and "_quartier_pending" not in ss:
+            try:
+                cached_state = get_cached_state(state_address, radius_m)
+            except OSError:
+                cached_state = None
+            if cached_state and any(cached_state.get(key) for key in _STATE_TEXT_KEYS):
+                ss["_quartier_pending"] = {
+                    key: cached_state[key] for key in QUARTIER_TRANSPORT_SESSION_KEYS if key in cached_state
+                }
+                ss.update(
+                    {key: value for key, value in cached_state.items() if key not in QUARTIER_TRANSPORT_SESSION_KEYS}
+                )
 
     apply_pending_fields(
-        st.session_state,
+        ss,
         "_quartier_pending",
         QUARTIER_TRANSPORT_SESSION_KEYS,
     )
 
+    def _remember_poi_results(results: dict[str, list[POIResult]], poi_key) -> None:
+        ss["_poi_results"] = results
+        ss["_poi_provider"] = _resolve_poi_provider(results)
+        ss["_poi_address"] = normalize_address(ss.get("bien_addr", "") or "")
+        ss["_poi_key"] = poi_key
+
+    def _collect_prefetched_pois(future, poi_key) -> None:
+        if future is None:
+            return
+        try:
+            results, poi_report = future.result()
+        except Exception as exc:
+            LOGGER.warning("Préchargement des POI en échec", exc_info=exc)
+            run_report.add_provider_warning(f"POI indisponibles (préchargement {type(exc).__name__}): {exc}")
+        else:
+            _remember_poi_results(results, poi_key)
+            run_report.merge(poi_report)
+
     col_btn, col_hint = st.columns([1, 2])
     with col_btn:
-        enrich_clicked = st.button("✨ Enrichir auto", disabled=not st.session_state.get("bien_addr", "").strip())
+        enrich_clicked = st.button("✨ Enrichir auto", disabled=not ss.get("bien_addr", "").strip())
     with col_hint:
         st.caption("Saisissez l'adresse puis lancez l'enrichissement. Vous pouvez modifier manuellement si besoin.")
     sanitize_debug_toggle = st.checkbox("Debug enrichissement quartier/transports", key="sanitize_debug_toggle")
@@ -413,23 +745,31 @@ def render(config):
     if enrich_clicked:
         perf_transports: dict[str, object] = {}
         perf_geocode: dict[str, object] = {}
-        addr_raw = st.session_state.get("bien_addr", "").strip()
+        addr_raw = ss.get("bien_addr", "").strip()
         with st.spinner("Enrichissement quartier & transports…"):
             try:
                 _auto_geocode_or_stop("Géocodage automatique (enrichissement)", stop_on_error=False)
             except Exception:
                 pass
+            # POIs only need coordinates: fetch them while the LLM enrichment runs.
+            poi_future = None
+            poi_key = _poi_cache_key(ss.get("geo_lat"), ss.get("geo_lon"), radius_m)
+            if poi_key is not None:
+                poi_future = _submit_with_script_ctx(_load_pois, poi_key)
             try:
                 payload = enrich_quartier_and_transports(addr_raw, report=run_report)
-                st.session_state["_quartier_sanitize_debug"] = getattr(run_report, "quartier_sanitize_debug", {})
-                st.session_state["_quartier_pending"] = {
-                    "quartier_intro": payload.get("quartier_intro", st.session_state.get("quartier_intro", "")),
-                    "transport_metro_texte": payload.get("transport_metro_texte", st.session_state.get("transport_metro_texte", "")),
-                    "transport_bus_texte": payload.get("transport_bus_texte", st.session_state.get("transport_bus_texte", "")),
-                    "transport_taxi_texte": payload.get("transport_taxi_texte", st.session_state.get("transport_taxi_texte", "")),
+                ss["_quartier_sanitize_debug"] = getattr(run_report, "quartier_sanitize_debug", {})
+                ss["_quartier_pending"] = {
+                    "quartier_intro": payload.get("quartier_intro", ss.get("quartier_intro", "")),
+                    "transport_metro_texte": payload.get("transport_metro_texte", ss.get("transport_metro_texte", "")),
+                    "transport_bus_texte": payload.get("transport_bus_texte", ss.get("transport_bus_texte", "")),
+                    "transport_taxi_texte": payload.get("transport_taxi_texte", ss.get("transport_taxi_texte", "")),
                 }
+                ss["_est_state_dirty"] = True
+                _collect_prefetched_pois(poi_future, poi_key)
                 st.rerun()
             except Exception as exc:
+                _collect_prefetched_pois(poi_future, poi_key)
                 message = str(exc)
                 if isinstance(exc, StreamlitAPIException) or "cannot be modified after the widget" in message:
                     st.error("Erreur UI Streamlit: mise à jour des champs après instanciation. Correctif appliqué.")
@@ -437,7 +777,7 @@ def render(config):
                     st.error(f"LLM indisponible: {exc}")
 
     quartier_intro = st.text_area("Intro quartier (2-3 phrases)", key="quartier_intro")
-    st.session_state["q_txt"] = quartier_intro
+    ss["q_txt"] = quartier_intro
     col_q1, col_q2 = st.columns([1, 1])
     with col_q1:
         metro_txt = st.text_area(
@@ -456,10 +796,10 @@ def render(config):
             key="transport_taxi_texte",
             placeholder="Stations de taxi",
         )
-        st.session_state["q_tx"] = taxi_txt
+        ss["q_tx"] = taxi_txt
     st.caption("Le rendu final sera compact: Métro, ligne 2, 12 / Bus, ligne 30, 40, 54, 95")
     if sanitize_debug_toggle:
-        debug_data = st.session_state.get("_quartier_sanitize_debug") or {}
+        debug_data = ss.get("_quartier_sanitize_debug") or {}
         if debug_data:
             with st.expander("Debug sanitize quartier/transports", expanded=False):
                 st.write("Avant sanitize")
@@ -479,28 +819,30 @@ def render(config):
         if st.button("Remplir Transports (auto)", key="legacy_transports_btn"):
             lat, lon, provider_used, perf_geocode = _geocode_main_address(show_debug=geocode_debug)
             if lat is not None:
+                # Warm the POI lists while transports load; both only need the coordinates.
+                poi_future = None
+                poi_key = _poi_cache_key(lat, lon, radius_m)
+                if ss.get("_poi_key") != poi_key or not ss.get("_poi_results"):
+                    poi_future = _submit_with_script_ctx(_load_pois, poi_key)
                 start_tr = perf_counter()
                 with st.spinner("Chargement des transports…"):
                     try:
-                        radius_raw = st.session_state.get("radius_m", DEFAULT_RADIUS_M)
-                        try:
-                            radius = int(radius_raw)
-                        except (TypeError, ValueError):
-                            radius = DEFAULT_RADIUS_M
                         warning_count = len(run_report.provider_warnings)
-                        tr = get_transports(lat, lon, radius_m=radius, mode=transport_mode, report=run_report)
-                        st.session_state["q_tx"] = ", ".join(tr.get("taxis", []))
-                        st.session_state["metro_lines_auto"] = tr.get("metro_lines", [])
-                        st.session_state["bus_lines_auto"] = tr.get("bus_lines", [])
-                        metro_refs_tokens = _collect_line_refs(st.session_state["metro_lines_auto"], limit=3)
-                        bus_refs_tokens = _collect_line_refs(st.session_state["bus_lines_auto"], limit=3)
-                        if not st.session_state.get("transport_metro_texte"):
-                            st.session_state["transport_metro_texte"] = ", ".join(metro_refs_tokens)
-                        if not st.session_state.get("transport_bus_texte"):
-                            st.session_state["transport_bus_texte"] = ", ".join(bus_refs_tokens)
-                        if not st.session_state.get("transport_taxi_texte") and st.session_state.get("q_tx"):
-                            st.session_state["transport_taxi_texte"] = st.session_state["q_tx"]
-                        st.session_state["transport_providers"] = tr.get("provider_used", {})
+                        tr = get_transports(lat, lon, radius_m=radius_m, mode=transport_mode, report=run_report)
+                        ss["q_tx"] = ", ".join(tr.get("taxis", []))
+                        metro_items = tr.get("metro_lines", [])
+                        bus_items = tr.get("bus_lines", [])
+                        ss["metro_lines_auto"] = metro_items
+                        ss["bus_lines_auto"] = bus_items
+                        # Only build the line refs for fields the user has not filled in.
+                        if not ss.get("transport_metro_texte"):
+                            ss["transport_metro_texte"] = ", ".join(_collect_line_refs(metro_items, limit=3))
+                        if not ss.get("transport_bus_texte"):
+                            ss["transport_bus_texte"] = ", ".join(_collect_line_refs(bus_items, limit=3))
+                        if not ss.get("transport_taxi_texte") and ss.get("q_tx"):
+                            ss["transport_taxi_texte"] = ss["q_tx"]
+                        ss["transport_providers"] = tr.get("provider_used", {})
+                        ss["_est_state_dirty"] = True
                         new_warnings = run_report.provider_warnings[warning_count:]
                         for warning in new_warnings:
                             st.warning(warning)
@@ -519,15 +861,16 @@ def render(config):
                         )
                     except Exception as e:
                         st.warning(f"Transports non chargés: {e}")
-                        st.session_state['transport_providers'] = {}
+                        ss['transport_providers'] = {}
+                _collect_prefetched_pois(poi_future, poi_key)
             else:
-                st.session_state["q_tx"] = ""
-                st.session_state['metro_lines_auto'] = []
-                st.session_state['bus_lines_auto'] = []
-                st.session_state['transport_providers'] = {}
-                st.session_state["transport_metro_texte"] = st.session_state.get("transport_metro_texte", "")
-                st.session_state["transport_bus_texte"] = st.session_state.get("transport_bus_texte", "")
-                st.session_state["transport_taxi_texte"] = st.session_state.get("transport_taxi_texte", "")
+                ss["q_tx"] = ""
+                ss['metro_lines_auto'] = []
+                ss['bus_lines_auto'] = []
+                ss['transport_providers'] = {}
+                ss["transport_metro_texte"] = ss.get("transport_metro_texte", "")
+                ss["transport_bus_texte"] = ss.get("transport_bus_texte", "")
+                ss["transport_taxi_texte"] = ss.get("transport_taxi_texte", "")
             if geocode_debug:
                 with st.expander("Détails performance", expanded=True):
                     if perf_geocode:
@@ -539,22 +882,27 @@ def render(config):
                             f"affichés métro/bus: {perf_transports.get('metro_count', 0)}/{perf_transports.get('bus_count', 0)}"
                         )
 
+    # Sauvegarde uniquement après un enrichissement ou un remplissage auto des
+    # transports, et seulement si un champ texte a été rempli.
+    if ss.pop("_est_state_dirty", False) and state_address:
+        state_snapshot = snapshot_state(ss)
+        if any(state_snapshot.get(key) for key in _STATE_TEXT_KEYS):
+            try:
+                set_cached_state(state_address, radius_m, state_snapshot)
+            except OSError:
+                pass
+
     # ---- Incontournables (3), Spots (2), Visites (2 + images) ----
     st.subheader("Adresses du quartier (Slide 4)")
     st.caption(f"POI providers : {_compact_provider_status()}")
-    radius_raw = st.session_state.get("radius_m", DEFAULT_RADIUS_M)
-    try:
-        radius_m = int(radius_raw)
-    except (TypeError, ValueError):
-        radius_m = DEFAULT_RADIUS_M
 
-    address_raw = (st.session_state.get("bien_addr", "") or "").strip()
+    address_raw = (ss.get("bien_addr", "") or "").strip()
     normalized_address = normalize_address(address_raw)
-    if st.session_state.get("_poi_address") and st.session_state.get("_poi_address") != normalized_address:
-        for key in ("_poi_results", "_poi_provider", "_poi_radius"):
-            st.session_state.pop(key, None)
-    if st.session_state.get("_auto_geo_attempted_addr") and st.session_state.get("_auto_geo_attempted_addr") != normalized_address:
-        st.session_state.pop("_auto_geo_attempted_addr")
+    if ss.get("_poi_address") and ss.get("_poi_address") != normalized_address:
+        for key in ("_poi_results", "_poi_provider", "_poi_key"):
+            ss.pop(key, None)
+    if ss.get("_auto_geo_attempted_addr") and ss.get("_auto_geo_attempted_addr") != normalized_address:
+        ss.pop("_auto_geo_attempted_addr")
 
     def _to_float(value) -> float | None:
         try:
@@ -562,28 +910,34 @@ def render(config):
         except (TypeError, ValueError):
             return None
 
-    lat_val = _to_float(st.session_state.get("geo_lat"))
-    lon_val = _to_float(st.session_state.get("geo_lon"))
+    lat_val = _to_float(ss.get("geo_lat"))
+    lon_val = _to_float(ss.get("geo_lon"))
 
-    if (lat_val is None or lon_val is None) and normalized_address and st.session_state.get("_auto_geo_attempted_addr") != normalized_address:
+    # Without a template nothing can be generated: leave geocoding to the explicit buttons.
+    if (
+        selected_template is not None
+        and (lat_val is None or lon_val is None)
+        and normalized_address
+        and ss.get("_auto_geo_attempted_addr") != normalized_address
+    ):
         st.info("Coordonnées manquantes : géocodage automatique en cours…")
         lat_val, lon_val, _ = _auto_geocode_or_stop("Géocodage automatique", stop_on_error=False)
-        st.session_state["_auto_geo_attempted_addr"] = normalized_address
-        lat_val = _to_float(st.session_state.get("geo_lat"))
-        lon_val = _to_float(st.session_state.get("geo_lon"))
+        ss["_auto_geo_attempted_addr"] = normalized_address
+        lat_val = _to_float(ss.get("geo_lat"))
+        lon_val = _to_float(ss.get("geo_lon"))
 
-    provider_in_state = st.session_state.get("geocode_provider") or ""
+    provider_in_state = ss.get("geocode_provider") or ""
     coord_caption = "Non géocodé"
     if lat_val is not None and lon_val is not None:
         provider_label = provider_in_state or "N/A"
         coord_caption = f"Coordonnées: OK ({lat_val:.4f}, {lon_val:.4f}) via {provider_label}"
-        if st.session_state.get("geocoded_address") and st.session_state.get("geocoded_address") != normalized_address:
-            coord_caption = f"Coordonnées présentes (adresse précédente: {st.session_state.get('geocoded_address')})."
+        if ss.get("geocoded_address") and ss.get("geocoded_address") != normalized_address:
+            coord_caption = f"Coordonnées présentes (adresse précédente: {ss.get('geocoded_address')})."
 
     incontournables_items: list[POIResult] = []
     spots_items: list[POIResult] = []
     visits_items: list[POIResult] = []
-    poi_provider = st.session_state.get("_poi_provider", "") if st.session_state.get("_poi_address") == normalized_address else ""
+    poi_provider = ss.get("_poi_provider", "") if ss.get("_poi_address") == normalized_address else ""
 
     poi_btn_col, poi_status_col = st.columns([1, 2])
     with poi_btn_col:
@@ -596,16 +950,9 @@ def render(config):
                 lat_val, lon_val = manual_lat, manual_lon
                 st.success(f"Coordonnées mises à jour (via {manual_provider or provider_in_state or 'géo'}).")
 
-    def _resolve_poi_provider(results: dict[str, list[POIResult]]) -> str:
-        for bucket in ("incontournables", "spots", "visits"):
-            items = results.get(bucket) or []
-            if items:
-                return items[0].provider
-        return ""
-
-    cached_poi = st.session_state.get("_poi_results") if st.session_state.get("_poi_address") == normalized_address else None
-    cached_radius = st.session_state.get("_poi_radius")
-    poi_results = cached_poi if cached_poi and cached_radius == radius_m else None
+    cached_poi = ss.get("_poi_results") if ss.get("_poi_address") == normalized_address else None
+    poi_key = _poi_cache_key(lat_val, lon_val, radius_m)
+    poi_results = cached_poi if cached_poi and ss.get("_poi_key") == poi_key else None
     poi_attempted = load_poi_clicked or poi_results is not None
 
     if load_poi_clicked:
@@ -613,24 +960,21 @@ def render(config):
         if lat_val is None or lon_val is None:
             st.error("Coordonnées introuvables : géocodage automatique requis.")
             st.stop()
+        poi_key = _poi_cache_key(lat_val, lon_val, radius_m)
+        reuse_cached = bool(cached_poi) and any(cached_poi.values()) and ss.get("_poi_key") == poi_key
+        poi_results = cached_poi if reuse_cached else None
+
+    if load_poi_clicked and poi_results is None:
         try:
             with st.spinner("Chargement des lieux…"):
-                poi_results = get_pois(
-                    lat_val,
-                    lon_val,
-                    radius_m,
-                    categories=("incontournables", "spots", "visits"),
-                    report=run_report,
-                )
+                poi_results, poi_report = _load_pois(poi_key)
         except Exception as exc:
             run_report.add_provider_warning(f"POI indisponibles: {exc}", blocking=True)
             st.error(f"Impossible de charger les lieux automatiquement: {exc}")
         else:
-            st.session_state["_poi_results"] = poi_results
-            st.session_state["_poi_provider"] = _resolve_poi_provider(poi_results)
-            st.session_state["_poi_address"] = normalized_address
-            st.session_state["_poi_radius"] = radius_m
-            poi_provider = st.session_state.get("_poi_provider", "")
+            run_report.merge(poi_report)
+            _remember_poi_results(poi_results, poi_key)
+            poi_provider = ss.get("_poi_provider", "")
 
     if poi_results:
         incontournables_items = poi_results.get("incontournables", [])
@@ -651,19 +995,26 @@ def render(config):
         if not items:
             st.multiselect(label, options=[], default=[])
             for key in key_list:
-                st.session_state[key] = ""
+                if ss.get(key) != "":
+                    ss[key] = ""
             return []
 
+        # Labels and name index depend only on the POI list: rebuilt when it is reloaded.
+        choices_key = f"_place_choices_{key_list[0]}"
+        choices = ss.get(choices_key)
+        if choices is None or choices[0] is not items:
+            choices = (items, *_place_choices(items))
+            ss[choices_key] = choices
+        _, labels, name_to_indices = choices
+
         options = list(range(len(items)))
-        stored_names = [
-            st.session_state.get(key, "")
-            for key in key_list
-            if st.session_state.get(key)
-        ]
         default_indices: list[int] = []
-        for name in stored_names:
-            for idx, place in enumerate(items):
-                if place.name == name and idx not in default_indices:
+        for key in key_list:
+            name = ss.get(key)
+            if not name:
+                continue
+            for idx in name_to_indices.get(name, ()):
+                if idx not in default_indices:
                     default_indices.append(idx)
                     break
         if not default_indices:
@@ -673,22 +1024,24 @@ def render(config):
             label,
             options=options,
             default=default_indices[:max_selection],
-            format_func=lambda idx: f"{items[idx].name} ({round(items[idx].distance_m or 0)} m)",
+            format_func=labels.__getitem__,
         )
         selection = selection[:max_selection]
         chosen_names = [items[idx].name for idx in selection]
         for offset, key in enumerate(key_list):
-            st.session_state[key] = chosen_names[offset] if offset < len(chosen_names) else ""
+            new_value = chosen_names[offset] if offset < len(chosen_names) else ""
+            if ss.get(key) != new_value:
+                ss[key] = new_value
         return chosen_names
 
     _select_places("Incontournables (max 3)", incontournables_items, ("i1", "i2", "i3"))
     _select_places("Spots (max 2)", spots_items, ("s1", "s2"))
 
-    prev_v1 = st.session_state.get("v1", "")
-    prev_v2 = st.session_state.get("v2", "")
+    prev_v1 = ss.get("v1", "")
+    prev_v2 = ss.get("v2", "")
     _select_places("Lieux à visiter (max 2)", visits_items, ("v1", "v2"))
-    new_v1 = st.session_state.get("v1", "")
-    new_v2 = st.session_state.get("v2", "")
+    new_v1 = ss.get("v1", "")
+    new_v2 = ss.get("v2", "")
     if new_v1 != prev_v1:
         for key in (
             "visite1_candidates",
@@ -696,8 +1049,9 @@ def render(config):
             "visite1_img_path",
             "visite1_provider",
             "visite1_uploaded_path",
+            "visite1_download_future",
         ):
-            st.session_state.pop(key, None)
+            ss.pop(key, None)
     if new_v2 != prev_v2:
         for key in (
             "visite2_candidates",
@@ -705,43 +1059,72 @@ def render(config):
             "visite2_img_path",
             "visite2_provider",
             "visite2_uploaded_path",
+            "visite2_download_future",
         ):
-            st.session_state.pop(key, None)
+            ss.pop(key, None)
 
-    st.session_state["visits_lookup"] = {place.name: place for place in visits_items}
+    # visits_items is the list kept in ss["_poi_results"]: same object until POIs reload.
+    if ss.get("_visits_lookup_src") is not visits_items:
+        ss["visits_lookup"] = {place.name: place for place in visits_items}
+        ss["_visits_lookup_src"] = visits_items
 
     st.caption("images: Wikimedia")
     col_v1, col_v2 = st.columns(2)
 
+    def _resolve_image_download(slot: str) -> None:
+        pending = ss.get(f"{slot}_download_future")
+        if pending is None:
+            return
+        future, source = pending
+        if not future.done():
+            _image_download_progress(slot)
+            return
+        ss.pop(f"{slot}_download_future", None)
+        try:
+            path = future.result()
+        except Exception as exc:
+            run_report.add_provider_warning(f"Téléchargement image Wikimedia impossible: {exc}")
+            st.warning(f"Téléchargement impossible: {exc}")
+        else:
+            ss[f"{slot}_img_path"] = path
+            ss[f"{slot}_provider"] = source
+            st.success("Image enregistrée.")
+
     def _render_visit_column(slot: str, title_key: str, column) -> None:
-        title_value = st.session_state.get(title_key, "")
+        title_value = ss.get(title_key, "")
         with column:
             st.markdown(f"**{('Visite 1' if slot == 'visite1' else 'Visite 2')}**")
+            if not title_value and not any(
+                ss.get(f"{slot}_{suffix}")
+                for suffix in ("candidates", "img_path", "uploaded_path", "download_future")
+            ):
+                st.caption("Sélectionnez un lieu ci-dessus")
+                return
             if st.button(f"Trouver images {('Visite 1' if slot == 'visite1' else 'Visite 2')}", key=f"find_{slot}"):
                 if not title_value:
                     st.warning("Sélectionnez d'abord un lieu dans la liste.")
                 else:
                     try:
-                        service = WikiImageService()
-                        candidates = service.candidates(title=title_value, city=None, country=None, limit=5)
+                        candidates = _cached_wiki_candidates(title_value, 5)
                     except Exception as exc:
                         run_report.add_provider_warning(f"Wikimedia images indisponibles: {exc}")
                         st.warning(f"Images indisponibles: {exc}")
                     else:
-                        st.session_state[f"{slot}_candidates"] = [cand.to_dict() for cand in candidates]
-                        st.session_state.pop(f"{slot}_choice", None)
+                        ss[f"{slot}_candidates"] = [ImageCandidate.from_dict(item) for item in candidates]
+                        ss.pop(f"{slot}_choice", None)
 
             upload_state_key = f"{slot}_uploaded_path"
             candidates = _restore_candidates(f"{slot}_candidates")
             if candidates:
                 options = list(range(len(candidates)))
                 choice_key = f"{slot}_choice"
-                if options and st.session_state.get(choice_key) not in options:
-                    st.session_state[choice_key] = options[0]
+                if options and ss.get(choice_key) not in options:
+                    ss[choice_key] = options[0]
+                captions = [f"Option {idx + 1} – source: {cand.source}" for idx, cand in enumerate(candidates)]
                 selected_idx = st.radio(
                     "Sélectionner une image",
                     options=options,
-                    format_func=lambda idx: f"Option {idx + 1} – source: {candidates[idx].source}",
+                    format_func=captions.__getitem__,
                     key=choice_key,
                 )
                 cols = st.columns(min(len(candidates), 5))
@@ -750,15 +1133,9 @@ def render(config):
                         st.image(candidate.thumb_url or candidate.url, width=160, caption=f"Option {idx + 1}")
                 if st.button("Valider l'image", key=f"confirm_{slot}"):
                     chosen = candidates[selected_idx]
-                    try:
-                        path = WikiImageService().download(chosen.url)
-                    except Exception as exc:
-                        run_report.add_provider_warning(f"Téléchargement image Wikimedia impossible: {exc}")
-                        st.warning(f"Téléchargement impossible: {exc}")
-                    else:
-                        st.session_state[f"{slot}_img_path"] = path
-                        st.session_state[f"{slot}_provider"] = chosen.source or "Wikimedia"
-                        st.success("Image enregistrée.")
+                    future = _download_executor().submit(_wiki_service().download, chosen.url)
+                    ss[f"{slot}_download_future"] = (future, chosen.source or "Wikimedia")
+            _resolve_image_download(slot)
 
             st.markdown("**Ou importer votre propre photo :**")
             uploaded_file = st.file_uploader(
@@ -775,21 +1152,21 @@ def render(config):
                 except Exception as exc:  # pragma: no cover - safety net for runtime errors
                     st.warning(f"Échec de l'enregistrement: {exc}")
                 else:
-                    st.session_state[upload_state_key] = saved_path
-                    st.session_state[f"{slot}_provider"] = "image importée"
+                    ss[upload_state_key] = saved_path
+                    ss[f"{slot}_provider"] = "image importée"
                     uploaded_path = saved_path
                     st.caption("Image importée enregistrée.")
 
-            uploaded_path = st.session_state.get(upload_state_key)
-            img_path = st.session_state.get(f"{slot}_img_path")
+            uploaded_path = ss.get(upload_state_key)
+            img_path = ss.get(f"{slot}_img_path")
             final_preview = uploaded_path or img_path
             if final_preview:
-                st.image(final_preview, width=260)
-                provider = "image importée" if uploaded_path else (st.session_state.get(f"{slot}_provider") or "Wikimedia")
+                st.image(_image_bytes(final_preview), width=260)
+                provider = "image importée" if uploaded_path else (ss.get(f"{slot}_provider") or "Wikimedia")
                 st.caption(f"Source : {provider}")
                 if st.button("Réinitialiser l'image", key=f"reset_{slot}"):
                     for key in (f"{slot}_img_path", f"{slot}_provider", upload_state_key):
-                        st.session_state.pop(key, None)
+                        ss.pop(key, None)
 
     _render_visit_column("visite1", "v1", col_v1)
     _render_visit_column("visite2", "v2", col_v2)
@@ -798,26 +1175,26 @@ def render(config):
     st.subheader("Points forts & Challenges (Slide 5)")
     colPF, colCH = st.columns(2)
     with colPF:
-        point_fort_1 = st.text_input("Point fort 1", st.session_state.get("pf1", "Proche des transports"), key="pf1")
-        point_fort_2 = st.text_input("Point fort 2", st.session_state.get("pf2", "Récemment rénové"), key="pf2")
-        point_fort_3 = st.text_input("Point fort 3", value=st.session_state.get("pf3", ""), key="pf3")
+        point_fort_1 = st.text_input("Point fort 1", ss.get("pf1", "Proche des transports"), key="pf1")
+        point_fort_2 = st.text_input("Point fort 2", ss.get("pf2", "Récemment rénové"), key="pf2")
+        point_fort_3 = st.text_input("Point fort 3", value=ss.get("pf3", ""), key="pf3")
     with colCH:
-        challenge_1 = st.text_input("Challenge 1", st.session_state.get("ch1", "Pas d’ascenseur"), key="ch1")
-        challenge_2 = st.text_input("Challenge 2", st.session_state.get("ch2", "Bruit de la rue en journée"), key="ch2")
-        challenge_3 = st.text_input("Challenge 3", value=st.session_state.get("ch3", ""), key="ch3")
+        challenge_1 = st.text_input("Challenge 1", ss.get("ch1", "Pas d’ascenseur"), key="ch1")
+        challenge_2 = st.text_input("Challenge 2", ss.get("ch2", "Bruit de la rue en journée"), key="ch2")
+        challenge_3 = st.text_input("Challenge 3", value=ss.get("ch3", ""), key="ch3")
 
     st.caption(
-        f"Points forts: {', '.join([v for v in [st.session_state.get('pf1'), st.session_state.get('pf2'), st.session_state.get('pf3')] if v])}"
+        f"Points forts: {', '.join([v for v in [ss.get('pf1'), ss.get('pf2'), ss.get('pf3')] if v])}"
     )
     st.caption(
-        f"Challenges: {', '.join([v for v in [st.session_state.get('ch1'), st.session_state.get('ch2'), st.session_state.get('ch3')] if v])}"
+        f"Challenges: {', '.join([v for v in [ss.get('ch1'), ss.get('ch2'), ss.get('ch3')] if v])}"
     )
 
     # ---- Revenus + scénarios ----
     st.subheader("Paramètres revenus")
-    default_platform_fee = float(st.session_state.get("platform_fee_pct", 15.0))
-    default_mfy_commission = float(st.session_state.get("mfy_commission_pct", st.session_state.get("rn_comm", 20.0)))
-    default_cleaning_fee = float(st.session_state.get("cleaning_fee_eur", st.session_state.get("rn_menage", 0.0)))
+    default_platform_fee = float(ss.get("platform_fee_pct", 15.0))
+    default_mfy_commission = float(ss.get("mfy_commission_pct", ss.get("rn_comm", 20.0)))
+    default_cleaning_fee = float(ss.get("cleaning_fee_eur", ss.get("rn_menage", 0.0)))
 
     colA, colB, colC, colD, colE = st.columns(5)
     with colA:
@@ -830,14 +1207,14 @@ def render(config):
         )
     with colD:
         mfy_commission_pct = st.slider(
-            "Commission MFY (%)", min_value=0.0, max_value=50.0, value=float(default_mfy_commission), step=1.0, key="mfy_commission_pct"
+            "Commission MFY (%)", min_value=0.0, max_value=50.0, value=default_mfy_commission, step=1.0, key="mfy_commission_pct"
         )
     with colE:
         cleaning_fee_eur = st.number_input(
             "Frais de ménage (mensuels, €)", min_value=0.0, value=default_cleaning_fee, step=5.0, key="cleaning_fee_eur"
         )
-        st.session_state["rn_menage"] = cleaning_fee_eur
-    st.session_state["rn_comm"] = float(mfy_commission_pct)
+        ss["rn_menage"] = cleaning_fee_eur
+    ss["rn_comm"] = mfy_commission_pct
 
     st.markdown("**Scénarios de prix (nuitée)**")
     c1, c2, c3 = st.columns(3)
@@ -850,18 +1227,23 @@ def render(config):
 
     days_per_month = ESTIMATION_DAYS_PER_MONTH_CD if estimation_type == "CD" else ESTIMATION_DAYS_PER_MONTH_MD
 
-    calc = compute_revenue(RevenueInputs(
-        prix_nuitee=float(prix_nuitee),
-        taux_occupation_pct=float(taux_occupation),
-        platform_fee_pct=float(platform_fee_pct),
-        mfy_commission_pct=float(mfy_commission_pct),
-        frais_menage_mensuels=float(cleaning_fee_eur),
-    ), days_per_month=days_per_month)
+    # Revenus recalculés seulement si un des paramètres a changé depuis le dernier rerun.
+    revenue_key = (prix_nuitee, taux_occupation, platform_fee_pct, mfy_commission_pct, cleaning_fee_eur, days_per_month)
+    if ss.get("_revenue_key") != revenue_key or "_revenue_calc" not in ss:
+        calc = compute_revenue(RevenueInputs(
+            # Float number_inputs/sliders already return floats; only the % slider is an int.
+            prix_nuitee=prix_nuitee,
+            taux_occupation_pct=float(taux_occupation),
+            platform_fee_pct=platform_fee_pct,
+            mfy_commission_pct=mfy_commission_pct,
+            frais_menage_mensuels=cleaning_fee_eur,
+        ), days_per_month=days_per_month)
+        ss["_revenue_calc"] = calc
+        ss["_revenue_mapping"] = build_revenue_token_mapping(calc)
+        ss["_revenue_key"] = revenue_key
+    calc = ss["_revenue_calc"]
 
     REV_BRUT = calc["revenu_brut"]
-    FRAIS_GEN = calc["frais_generaux"]
-    REV_NET = calc["revenu_net"]
-    JOURS_OCC = calc["jours_occupes"]
     PLATFORM_FEE_PCT = calc["platform_fee_pct"]
     PLATFORM_FEE_EUR = calc["platform_fee_eur"]
     BASE_COMMISSION = calc["base_commission"]
@@ -869,13 +1251,14 @@ def render(config):
     MFY_COMMISSION_EUR = calc["mfy_commission_eur"]
     CLEANING_FEE_EUR = calc["cleaning_fee_eur"]
 
-    revenue_mapping = build_revenue_token_mapping(calc)
+    revenue_mapping = ss["_revenue_mapping"]
 
-    st.metric("Jours loués / mois", f"{JOURS_OCC:.1f} j")
+    # Same formatting as the PPTX tokens: reuse the strings built once above.
+    st.metric("Jours loués / mois", revenue_mapping["[[JOURS_OCC]]"])
     colX, colY, colZ = st.columns(3)
-    colX.metric("Revenu brut", f"{REV_BRUT:.0f} €")
-    colY.metric("Frais généraux", f"{FRAIS_GEN:.0f} €")
-    colZ.metric("Revenu net", f"{REV_NET:.0f} €")
+    colX.metric("Revenu brut", revenue_mapping["[[REV_BRUT]]"])
+    colY.metric("Frais généraux", revenue_mapping["[[FRAIS_GEN]]"])
+    colZ.metric("Revenu net", revenue_mapping["[[REV_NET]]"])
 
     with st.expander("Debug revenus / mapping", expanded=False):
         st.write({
@@ -890,134 +1273,41 @@ def render(config):
         st.json(revenue_mapping)
 
     # Scénarios prix
-    PRIX_PESS = prix_nuitee * coef_pess
-    PRIX_CIBLE = prix_nuitee * coef_cible
-    PRIX_OPT = prix_nuitee * coef_opt
+    scenario_prices = tuple(prix_nuitee * coef for coef in (coef_pess, coef_cible, coef_opt))
 
     st.markdown("**Évo du prix/nuitée**")
-    histo_col_btn, histo_col_preview = st.columns([1, 3])
-    histo_error = None
+    base_price_value: Optional[float] = None
+    base_price_error: Optional[str] = None
     if should_generate_estimation_histo(estimation_type):
         try:
             base_price_value = _resolve_base_nightly_price()
         except ValueError as exc:
-            base_price_value = None
-            histo_error = str(exc)
-
-        with histo_col_btn:
-            regen_clicked = st.button(
-                "(Re)générer graphique",
-                key="regen_estimation_histo",
-                disabled=base_price_value is None,
-            )
-            if histo_error:
-                st.error(histo_error)
-            if regen_clicked and base_price_value is not None:
-                try:
-                    plot_path = generate_estimation_histo_if_needed(estimation_type, base_price_value)
-                    st.session_state["estimation_histo_png"] = plot_path
-                    st.success("Graphique mis à jour.")
-                except Exception as exc:
-                    st.error(f"Échec de la génération du graphique: {exc}")
-
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-        default_plot_path = os.path.join(base_dir, "out", "plots", "estimation_histo.png")
-        preview_path = st.session_state.get("estimation_histo_png", default_plot_path)
-        if not preview_path or not os.path.exists(preview_path):
-            preview_path = None
-
-        with histo_col_preview:
-            if preview_path:
-                st.image(preview_path, caption="Évo du prix/nuitée")
-            elif not histo_error:
-                st.caption("Graphique non généré pour le moment.")
+            base_price_error = str(exc)
+        _estimation_histo_panel(estimation_type, base_price_value, base_price_error)
     else:
+        histo_col_btn, histo_col_preview = st.columns([1, 3])
         with histo_col_btn:
             st.info("Mode MD : histogramme ignoré.")
         with histo_col_preview:
             st.caption("Le template Moyenne durée ne contient pas la section graphique.")
 
-    transports_compact = build_compact_transport_texts(
-        st.session_state.get("transport_metro_texte", ""),
-        st.session_state.get("transport_bus_texte", ""),
-        st.session_state.get("transport_taxi_texte", ""),
-    )
-    transport_state_for_mapping = dict(st.session_state)
-    transport_state_for_mapping.update(transports_compact)
-
-    # Mapping Estimation
-    mapping = {
-        # Slide 4
-        "[[ADRESSE]]": st.session_state.get("bien_addr",""),
-        **build_quartier_transport_tokens_mapping(transport_state_for_mapping),
-        "[[INCONTOURNABLE_1_NOM]]": st.session_state.get('i1', ''),
-        "[[INCONTOURNABLE_2_NOM]]": st.session_state.get('i2', ''),
-        "[[INCONTOURNABLE_3_NOM]]": st.session_state.get('i3', ''),
-        "[[SPOT_1_NOM]]": st.session_state.get('s1', ''),
-        "[[SPOT_2_NOM]]": st.session_state.get('s2', ''),
-        "[[VISITE_1_NOM]]": st.session_state.get('v1', ''),
-        "[[VISITE_2_NOM]]": st.session_state.get('v2', ''),
-        # Slide 5 (valeurs numériques + PF/Challenges)
-        "[[NB_SURFACE]]": f"{st.session_state.get('bien_surface',0):.0f}",
-        "[[NB_PIECES]]": f"{int(st.session_state.get('bien_pieces',0))}",
-        "[[NB_SDB]]": f"{int(st.session_state.get('bien_sdb',0))}",
-        "[[NB_COUCHAGES]]": f"{int(st.session_state.get('bien_couchages',0))}",
-        "[[MODE_CHAUFFAGE]]": st.session_state.get('bien_chauffage',''),
-        "[[POINT_FORT_1]]": st.session_state.get('pf1',''),
-        "[[POINT_FORT_2]]": st.session_state.get('pf2',''),
-        "[[POINT_FORT_3]]": st.session_state.get('pf3',''),
-        "[[CHALLENGE_1]]": st.session_state.get('ch1',''),
-        "[[CHALLENGE_2]]": st.session_state.get('ch2',''),
-        "[[CHALLENGE_3]]": st.session_state.get('ch3',''),
-        # Slide 6
-        "[[PRIX_NUIT]]": f"{st.session_state.get('rn_prix',0):.0f} €",
-        "[[TAUX_OCC]]": f"{st.session_state.get('rn_occ',0)} %",
-        "[[PRIX_PESSIMISTE]]": f"{PRIX_PESS:.0f} €",
-        "[[PRIX_CIBLE]]": f"{PRIX_CIBLE:.0f} €",
-        "[[PRIX_OPTIMISTE]]": f"{PRIX_OPT:.0f} €",
-    }
-    mapping.update(revenue_mapping)
-
-    # Images for VISITE_1/2 (from confirmed paths or uploaded files)
-    image_by_shape = {}
-    v1_uploaded = st.session_state.get("visite1_uploaded_path")
-    v2_uploaded = st.session_state.get("visite2_uploaded_path")
-    p1 = st.session_state.get('visite1_img_path')
-    p2 = st.session_state.get('visite2_img_path')
-
-    v1_final = v1_uploaded or p1
-    v2_final = v2_uploaded or p2
-
-    if v1_final:
-        image_by_shape["VISITE_1_MASK"] = v1_final
-    if v2_final:
-        image_by_shape["VISITE_2_MASK"] = v2_final
-
-    def _attach_map(target: dict[str, str]) -> None:
-        lat = st.session_state.get("geo_lat")
-        lon = st.session_state.get("geo_lon")
-        if lat and lon:
-            try:
-                map_path = build_static_map(lat, lon, pixel_radius=60, size=(900, 900))
-                target["MAP_MASK"] = map_path
-            except Exception as e:
-                st.warning(f"Carte non générée: {e}")
-
-    # === MAP ===
-    _attach_map(image_by_shape)
-
-    print("DBG image_by_shape (final):", image_by_shape)
-
     strict_mode = bool(os.environ.get("MFY_STRICT_GENERATION"))
     est_tpl_path = selected_template.path if selected_template else None
     validation_result = None
-    if est_tpl_path and os.path.exists(est_tpl_path):
+    # One stat per render: existence check and cache key for the validation.
+    est_tpl_mtime: Optional[float] = None
+    if est_tpl_path:
+        try:
+            est_tpl_mtime = os.stat(est_tpl_path).st_mtime
+        except OSError:
+            est_tpl_mtime = None
+    if est_tpl_mtime is not None:
         try:
-            validation_result = validate_pptx_template(
-                est_tpl_path,
-                set(mapping.keys()),
-                get_estimation_requirements(estimation_type),
-                requirement_detectors=get_estimation_detectors(estimation_type),
+            validation_result = _cached_validate_estimation_template(
+                str(est_tpl_path),
+                est_tpl_mtime,
+                _MAPPING_TOKENS,
+                estimation_type,
             )
         except Exception as exc:
             st.warning(f"Validation du template Estimation impossible: {exc}")
@@ -1027,27 +1317,45 @@ def render(config):
     st.subheader("Générer l'Estimation (PPTX)")
     disable_generate = (selected_template is None) or (strict_mode and validation_result is not None and validation_result.severity == "KO")
     if st.button("Générer le PPTX (Estimation)", disabled=disable_generate):
-        if not est_tpl_path or not os.path.exists(est_tpl_path):
+        if est_tpl_mtime is None:
             st.error("Aucun template PPTX sélectionné ou fichier introuvable. Déposez/choisissez un template ci-dessus.")
             st.stop()
         histo_path = None
         if should_generate_estimation_histo(estimation_type):
-            try:
-                base_price_value = _resolve_base_nightly_price()
-            except ValueError as exc:
-                st.error(f"Impossible de générer le graphique: {exc}")
+            if base_price_value is None:
+                st.error(f"Impossible de générer le graphique: {base_price_error}")
                 st.stop()
             try:
                 histo_path = generate_estimation_histo_if_needed(estimation_type, base_price_value)
-                st.session_state["estimation_histo_png"] = histo_path
+                ss["estimation_histo_png"] = histo_path
             except Exception as exc:
                 st.error(f"Graphique estimation indisponible: {exc}")
                 st.stop()
         else:
             run_report.add_note("Mode MD: histogramme ignoré")
         _auto_geocode_or_stop("Géocodage automatique (génération)")
-        _attach_map(image_by_shape)
-        pptx_out = os.path.join(OUT_DIR, f"Estimation {estimation_type} - {st.session_state.get('bien_addr','bien')}.pptx")
+        # Images for VISITE_1/2 (uploaded file first, then confirmed path) and the
+        # static map: only read when the PPTX is generated.
+        image_by_shape = {}
+        v1_final = ss.get("visite1_uploaded_path") or ss.get("visite1_img_path")
+        v2_final = ss.get("visite2_uploaded_path") or ss.get("visite2_img_path")
+        if v1_final:
+            image_by_shape["VISITE_1_MASK"] = v1_final
+        if v2_final:
+            image_by_shape["VISITE_2_MASK"] = v2_final
+        lat = ss.get("geo_lat")
+        lon = ss.get("geo_lon")
+        if lat and lon:
+            try:
+                image_by_shape["MAP_MASK"] = _static_map_path(lat, lon)
+            except Exception as e:
+                st.warning(f"Carte non générée: {e}")
+        LOGGER.debug("image_by_shape (final): %s", image_by_shape)
+        # Mapping Estimation : construit seulement au clic, il n'est lu qu'ici.
+        mapping = _build_estimation_mapping(ss, scenario_prices, revenue_mapping)
+        from app.services.pptx_fill import generate_estimation_pptx
+
+        pptx_out = os.path.join(OUT_DIR, f"Estimation {estimation_type} - {ss.get('bien_addr','bien')}.pptx")
         generation_report = generate_estimation_pptx(
             est_tpl_path,
             pptx_out,
@@ -1057,8 +1365,7 @@ def render(config):
             strict=strict_mode,
         )
         if validation_result and validation_result.notes:
-            for note in validation_result.notes:
-                generation_report.add_note(note)
+            generation_report.add_notes(validation_result.notes)
         generation_report.merge(run_report)
         if strict_mode and validation_result and validation_result.severity == "KO":
             st.error("Génération bloquée : le template n'est pas valide en mode strict.")
@@ -1067,7 +1374,7 @@ def render(config):
         else:
             st.success(f"OK: {pptx_out}")
             with open(pptx_out, "rb") as f:
-                st.download_button("Télécharger le PPTX", data=f.read(), file_name=os.path.basename(pptx_out))
+                st.download_button("Télécharger le PPTX", data=f, file_name=os.path.basename(pptx_out))
         render_generation_report(generation_report, strict=strict_mode)
 
     # =====================================================
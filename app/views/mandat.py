@@ -1,4 +1,5 @@
 import os
+import shutil
 from datetime import date
 from pathlib import Path
 
@@ -16,7 +17,7 @@ from app.services.template_catalog import (
 from app.services import template_roots
 from app.services.token_utils import extract_docx_tokens
 from app.services.token_audit import audit_template_tokens
-from .utils import _sanitize_filename, render_generation_report
+from .utils import _next_free_filename, _sanitize_filename, render_generation_report
 
 
 def render(config):
@@ -102,20 +103,15 @@ def render(config):
         if uploaded_docx:
             man_upload_dir.mkdir(parents=True, exist_ok=True)
             saved = 0
+            with os.scandir(man_upload_dir) as entries:
+                existing_names = {entry.name for entry in entries}
             for up in uploaded_docx:
-                safe_name = _sanitize_filename(up.name, "docx")
+                safe_name = _next_free_filename(_sanitize_filename(up.name, "docx"), existing_names)
+                existing_names.add(safe_name)
                 dst = man_upload_dir / safe_name
-                if dst.exists():
-                    base = dst.stem
-                    ext = dst.suffix
-                    i = 2
-                    candidate = man_upload_dir / f"{base} ({i}){ext}"
-                    while candidate.exists():
-                        i += 1
-                        candidate = man_upload_dir / f"{base} ({i}){ext}"
-                    dst = candidate
+                up.seek(0)
                 with open(dst, "wb") as f:
-                    f.write(up.getbuffer())
+                    shutil.copyfileobj(up, f, length=1 << 20)
                 saved += 1
             st.success(f"{saved} template(s) ajouté(s).")
             st.toast("Rafraîchissez la sélection ci-dessus pour utiliser les templates ajoutés.")
@@ -250,6 +246,6 @@ def render(config):
             st.success(f"OK : {out_path}")
             with open(out_path, "rb") as f:
                 st.download_button(
-                    "Télécharger le DOCX", data=f.read(), file_name=os.path.basename(out_path)
+                    "Télécharger le DOCX", data=f, file_name=os.path.basename(out_path)
                 )
         render_generation_report(report, strict=strict_mode)
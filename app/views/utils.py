@@ -1,10 +1,16 @@
+from __future__ import annotations
+
 import os
 import re
 from collections.abc import MutableMapping
+from typing import TYPE_CHECKING
+
 import streamlit as st
 
 from app.services.generation_report import GenerationReport
-from app.services.template_validation import ValidationResult
+
+if TYPE_CHECKING:
+    from app.services.template_validation import ValidationResult
 
 def _sanitize_filename(name: str, ext: str) -> str:
     base = os.path.basename(name)
@@ -13,6 +19,15 @@ def _sanitize_filename(name: str, ext: str) -> str:
         safe += f".{ext}"
     return safe
 
+def _next_free_filename(name: str, existing: set[str]) -> str:
+    if name not in existing:
+        return name
+    base, ext = os.path.splitext(name)
+    i = 2
+    while f"{base} ({i}){ext}" in existing:
+        i += 1
+    return f"{base} ({i}){ext}"
+
 @st.cache_data(ttl=5)
 def list_templates(dirpath: str, ext: str):
     try:
@@ -23,6 +38,36 @@ def list_templates(dirpath: str, ext: str):
         return []
 
 
+@st.cache_data(persist="disk", show_spinner=False, max_entries=256)
+def _cached_static_map(lat: float, lon: float, pixel_radius: int, width: int, height: int) -> str:
+    from app.services.map_image import build_static_map
+
+    return build_static_map(lat, lon, pixel_radius=pixel_radius, size=(width, height))
+
+
+# cache_resource rather than cache_data: bytes are immutable, so hits skip the pickle copy.
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _cached_image_bytes(path: str, mtime: float) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _image_bytes(path: str) -> bytes:
+    # Keyed on mtime: a file regenerated at the same path is read again.
+    return _cached_image_bytes(path, os.stat(path).st_mtime)
+
+
+def _static_map_path(lat: float, lon: float, pixel_radius: int = 60, size: tuple[int, int] = (900, 900)) -> str:
+    args = (round(float(lat), 5), round(float(lon), 5), pixel_radius, size[0], size[1])
+    path = _cached_static_map(*args)
+    if not os.path.exists(path):
+        # build_static_map writes to a temp file that may have been cleaned up:
+        # evict only this map and build it again.
+        _cached_static_map.clear(*args)
+        path = _cached_static_map(*args)
+    return path
+
+
 def render_generation_report(report: GenerationReport, *, strict: bool = False) -> None:
     """Affiche un rapport de génération dans l'UI Streamlit."""
     if report is None:
@@ -3,16 +3,11 @@ from __future__ import annotations
 
 import os
 import re
+import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-try:  # Optional pillow resizing
-    from PIL import Image
-except Exception:  # pragma: no cover - pillow may be unavailable at runtime
-    Image = None
-
-
 _ALLOWED_EXTENSIONS = {
     "image/png": ".png",
     "image/jpeg": ".jpg",
@@ -62,9 +57,14 @@ def save_uploaded_image(file: Any, prefix: str, dest_dir: str = "out/images/visi
     destination.mkdir(parents=True, exist_ok=True)
     path = destination / filename
 
+    file.seek(0)
     with path.open("wb") as fh:
-        fh.write(file.getbuffer())
+        shutil.copyfileobj(file, fh, length=64 * 1024)
 
+    try:  # Optional pillow resizing, imported lazily to keep page load light
+        from PIL import Image
+    except Exception:  # pragma: no cover - pillow may be unavailable at runtime
+        Image = None
     if Image is not None:
         try:
             with Image.open(path) as img:
@@ -11,7 +11,6 @@ from pathlib import Path
 from typing import Any, Dict, Iterable, List
 
 import requests
-from PIL import Image, ImageDraw, ImageFont
 
 from config import wiki_settings
 
@@ -289,6 +288,8 @@ class WikiImageService:
         path = images_dir / f"placeholder-{digest}.jpg"
         if path.exists():
             return str(path)
+        from PIL import Image, ImageDraw, ImageFont  # lazy: only needed for placeholders
+
         image = Image.new("RGB", (800, 600), color=(240, 240, 240))
         draw = ImageDraw.Draw(image)
         text = "Image non disponible"
@@ -0,0 +1,24 @@
+from app.services import book_tokens
+from app.services.book_tokens import build_book_mapping
+
+
+def test_line_refs_only_collected_when_no_manual_text(monkeypatch):
+    calls: list[list] = []
+    original = book_tokens._collect_line_refs
+
+    def _spy(items):
+        calls.append(items)
+        return original(items)
+
+    monkeypatch.setattr(book_tokens, "_collect_line_refs", _spy)
+    state = {
+        "metro_lines_auto": [{"ref": "M1"}, {"ref": "m1"}, {"name": "M4"}],
+        "bus_lines_auto": [{"ref": "38"}],
+        "transport_bus_texte": "Bus 38 et 21",
+    }
+
+    mapping = build_book_mapping(state)
+
+    assert mapping["[[TRANSPORT_METRO_TEXTE]]"] == "M1, M4"
+    assert mapping["[[TRANSPORT_BUS_TEXTE]]"] == "Bus 38 et 21"
+    assert calls == [state["metro_lines_auto"]]
@@ -4,8 +4,9 @@ from app.services.geo_helpers import ensure_geocoded
 from app.services.geocode_cache import normalize_address
 
 
-def test_ensure_geocoded_calls_fallback(monkeypatch):
+def test_ensure_geocoded_calls_fallback(monkeypatch, tmp_path):
     st.session_state.clear()
+    monkeypatch.setattr("app.services.geocode_cache.DEFAULT_CACHE_DIR", tmp_path)
 
     calls = {}
 
@@ -25,3 +26,23 @@ def test_ensure_geocoded_calls_fallback(monkeypatch):
     assert st.session_state["geocode_provider"] == "Geo"
     assert st.session_state["geocoded_address"] == normalize_address("12 rue du Test")
     assert calls["address"] == normalize_address("12 rue du Test")
+
+
+def test_ensure_geocoded_reuses_disk_cache(monkeypatch, tmp_path):
+    st.session_state.clear()
+    monkeypatch.setattr("app.services.geocode_cache.DEFAULT_CACHE_DIR", tmp_path)
+    calls: list[str] = []
+
+    def _fake_fallback(address: str, report=None):
+        calls.append(address)
+        return 12.34, 56.78, "Geoapify"
+
+    monkeypatch.setattr("app.services.geo_helpers.geocode_address_fallback", _fake_fallback)
+
+    ensure_geocoded("12 rue du Test", report=None)
+    st.session_state.clear()
+    lat, lon, provider = ensure_geocoded("12  Rue du Test", report=None)
+
+    assert (lat, lon, provider) == (12.34, 56.78, "Geoapify")
+    assert st.session_state["geocode_provider"] == "Geoapify"
+    assert calls == [normalize_address("12 rue du Test")]
@@ -0,0 +1,26 @@
+import pytest
+
+from app.views import estimation
+
+
+def test_resolve_base_nightly_price_priority(monkeypatch):
+    state = {"rn_prix": 120.0, "base_price": "", "price_per_night": "95"}
+    monkeypatch.setattr(estimation.st, "session_state", state, raising=False)
+
+    assert estimation._resolve_base_nightly_price() == 95.0
+
+
+def test_resolve_base_nightly_price_numeric_fast_path(monkeypatch):
+    monkeypatch.setattr(estimation.st, "session_state", {"rn_prix": 140}, raising=False)
+
+    value = estimation._resolve_base_nightly_price()
+
+    assert value == 140.0
+    assert isinstance(value, float)
+
+
+def test_resolve_base_nightly_price_missing(monkeypatch):
+    monkeypatch.setattr(estimation.st, "session_state", {"rn_prix": "abc"}, raising=False)
+
+    with pytest.raises(ValueError):
+        estimation._resolve_base_nightly_price()
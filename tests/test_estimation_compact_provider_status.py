@@ -0,0 +1,15 @@
+from app.views import estimation
+
+
+def test_compact_provider_status(monkeypatch):
+    monkeypatch.setattr(
+        estimation,
+        "get_provider_status",
+        lambda: {
+            "Google Places": {"enabled": False},
+            "Geoapify": {"enabled": True},
+            "Wikimedia": {"enabled": True},
+        },
+    )
+
+    assert estimation._compact_provider_status() == "Google ❌ / Geoapify ✅ / OTM ❌ / Wiki ✅"
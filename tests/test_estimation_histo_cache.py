@@ -0,0 +1,32 @@
+import os
+
+from app.views import estimation
+
+
+def test_estimation_histo_is_rebuilt_only_when_price_changes(monkeypatch, tmp_path):
+    calls: list[float] = []
+    target = tmp_path / "estimation_histo.png"
+
+    def _fake_build(price):
+        calls.append(price)
+        target.write_bytes(f"png {price}".encode())
+        return str(target)
+
+    monkeypatch.setattr("app.services.plots.build_estimation_histo", _fake_build)
+    monkeypatch.setattr(estimation, "_rendered_histo", {})
+
+    first = estimation.generate_estimation_histo_if_needed("CD", 120.0)
+    second = estimation.generate_estimation_histo_if_needed("CD", 120.001)
+    assert first == second == str(target)
+    assert calls == [120.0]
+
+    # A single PNG is kept: another price overwrites it, so going back re-renders.
+    estimation.generate_estimation_histo_if_needed("CD", 95.0)
+    estimation.generate_estimation_histo_if_needed("CD", 120.0)
+    assert calls == [120.0, 95.0, 120.0]
+    assert list(tmp_path.iterdir()) == [target]
+
+    os.remove(target)
+    again = estimation.generate_estimation_histo_if_needed("CD", 120.0)
+    assert os.path.exists(again)
+    assert calls == [120.0, 95.0, 120.0, 120.0]
@@ -0,0 +1,29 @@
+import os
+
+from app.views import utils
+
+
+def test_image_bytes_cached_until_file_changes(monkeypatch, tmp_path):
+    reads: list[str] = []
+    real_open = open
+
+    def _counting_open(path, mode="r", *args, **kwargs):
+        if path == str(image):
+            reads.append(mode)
+        return real_open(path, mode, *args, **kwargs)
+
+    image = tmp_path / "preview.png"
+    image.write_bytes(b"first")
+    monkeypatch.setattr("builtins.open", _counting_open)
+    utils._cached_image_bytes.clear()
+
+    assert utils._image_bytes(str(image)) == b"first"
+    assert utils._image_bytes(str(image)) == b"first"
+    assert len(reads) == 1
+
+    image.write_bytes(b"second")
+    stat = image.stat()
+    os.utime(image, (stat.st_atime, stat.st_mtime + 10))
+    assert utils._image_bytes(str(image)) == b"second"
+    assert len(reads) == 2
+    utils._cached_image_bytes.clear()
@@ -0,0 +1,64 @@
+from app.views import estimation
+
+
+def _state(**overrides):
+    state = {
+        "bien_addr": "1 rue Test",
+        "quartier_intro": "Quartier vivant",
+        "transport_metro_texte": "2, 12",
+        "transport_bus_texte": "30",
+        "transport_taxi_texte": "Stations de taxi",
+        "i1": "Louvre",
+        "v2": "Orsay",
+        "bien_surface": 42.4,
+        "bien_pieces": 2.0,
+        "bien_sdb": 1,
+        "bien_couchages": 4,
+        "bien_chauffage": "Gaz",
+        "pf1": "Lumineux",
+        "rn_prix": 120.0,
+        "rn_occ": 70,
+    }
+    state.update(overrides)
+    return state
+
+
+def test_build_estimation_mapping_values():
+    mapping = estimation._build_estimation_mapping(
+        _state(),
+        (108.0, 120.0, 132.4),
+        {"[[REVENU_NET]]": "1 000 €"},
+    )
+
+    assert mapping["[[ADRESSE]]"] == "1 rue Test"
+    assert mapping["[[QUARTIER_INTRO]]"] == "Quartier vivant"
+    assert mapping["[[TRANSPORT_METRO_TEXTE]]"].startswith("Métro, ligne")
+    assert mapping["[[INCONTOURNABLE_1_NOM]]"] == "Louvre"
+    assert mapping["[[INCONTOURNABLE_2_NOM]]"] == ""
+    assert mapping["[[VISITE_2_NOM]]"] == "Orsay"
+    assert mapping["[[NB_SURFACE]]"] == "42"
+    assert mapping["[[NB_PIECES]]"] == "2"
+    assert mapping["[[MODE_CHAUFFAGE]]"] == "Gaz"
+    assert mapping["[[PRIX_NUIT]]"] == "120 €"
+    assert mapping["[[TAUX_OCC]]"] == "70 %"
+    assert mapping["[[PRIX_PESSIMISTE]]"] == "108 €"
+    assert mapping["[[PRIX_OPTIMISTE]]"] == "132 €"
+    assert mapping["[[REVENU_NET]]"] == "1 000 €"
+
+
+def test_build_estimation_mapping_defaults_on_empty_state():
+    mapping = estimation._build_estimation_mapping({}, (0.0, 0.0, 0.0), {})
+
+    assert mapping["[[ADRESSE]]"] == ""
+    assert mapping["[[NB_SDB]]"] == "0"
+    assert mapping["[[PRIX_NUIT]]"] == "0 €"
+    assert mapping["[[TRANSPORT_TAXI_TEXTE]]"] == "Stations de taxi"
+
+
+def test_mapping_tokens_constant_matches_built_mapping():
+    from app.services.revenue import RevenueInputs, build_revenue_token_mapping, compute_revenue
+
+    calc = compute_revenue(RevenueInputs(120, 70, 15, 20, 30))
+    mapping = estimation._build_estimation_mapping(_state(), (1.0, 2.0, 3.0), build_revenue_token_mapping(calc))
+
+    assert frozenset(mapping) == estimation._MAPPING_TOKENS
@@ -0,0 +1,15 @@
+from app.services.poi_facade import POIResult
+from app.views import estimation
+
+
+def test_place_choices_labels_and_duplicate_names():
+    items = [
+        POIResult(name="Louvre", distance_m=120.4, provider="Google Places", raw=None),
+        POIResult(name="Café", distance_m=None, provider="Google Places", raw=None),
+        POIResult(name="Louvre", distance_m=300.0, provider="Google Places", raw=None),
+    ]
+
+    labels, name_to_indices = estimation._place_choices(items)
+
+    assert labels == ["Louvre (120 m)", "Café (0 m)", "Louvre (300 m)"]
+    assert name_to_indices == {"Louvre": [0, 2], "Café": [1]}
@@ -0,0 +1,65 @@
+import threading
+
+from app.views import estimation
+
+
+def test_poi_cache_key_rounds_coordinates():
+    key = estimation._poi_cache_key(48.8566123, 2.3522219, 500)
+    assert key == (48.85661, 2.35222, 500)
+    assert key == estimation._poi_cache_key(48.85661234, 2.35222194, 500)
+
+
+def test_poi_cache_key_depends_on_radius():
+    assert estimation._poi_cache_key(48.85, 2.35, 300) != estimation._poi_cache_key(48.85, 2.35, 600)
+
+
+def test_poi_cache_key_without_coordinates():
+    assert estimation._poi_cache_key(None, 2.35, 300) is None
+
+
+def test_load_pois_memoises_only_non_empty_lookups(monkeypatch):
+    calls: list[tuple] = []
+    responses = {
+        (48.85, 2.35, 300): {"incontournables": [estimation.POIResult("Louvre", 120.0, "Google Places", None)]},
+        (45.0, 5.0, 300): {"incontournables": [], "spots": [], "visits": []},
+    }
+
+    def _fake_get_pois(lat, lon, radius_m, categories, report=None):
+        calls.append((lat, lon, radius_m))
+        report.add_note("lookup")
+        report.add_provider_warning("quota Google dépassé")
+        return responses[(lat, lon, radius_m)]
+
+    monkeypatch.setattr(estimation, "get_pois", _fake_get_pois)
+    estimation._cached_pois.clear()
+
+    results, report = estimation._load_pois((48.85, 2.35, 300))
+    cached_results, cached_report = estimation._load_pois((48.85, 2.35, 300))
+    assert results["incontournables"][0].name == "Louvre"
+    assert report.notes == ["lookup"]
+    assert cached_results == results
+    # A cache hit does not replay the warnings of the original lookup.
+    assert cached_report.provider_warnings == []
+
+    empty, _ = estimation._load_pois((45.0, 5.0, 300))
+    estimation._load_pois((45.0, 5.0, 300))
+    assert not any(empty.values())
+
+    assert calls == [(48.85, 2.35, 300), (45.0, 5.0, 300), (45.0, 5.0, 300)]
+    estimation._cached_pois.clear()
+
+
+def test_poi_prefetch_thread_gets_script_run_context(monkeypatch):
+    ctx = object()
+    monkeypatch.setattr(estimation, "get_script_run_ctx", lambda: ctx)
+
+    def _read_ctx():
+        return getattr(threading.current_thread(), "streamlit_script_run_ctx", None)
+
+    assert estimation._submit_with_script_ctx(_read_ctx).result(timeout=5) is ctx
+
+    def _boom():
+        raise RuntimeError("quota")
+
+    future = estimation._submit_with_script_ctx(_boom)
+    assert isinstance(future.exception(timeout=5), RuntimeError)
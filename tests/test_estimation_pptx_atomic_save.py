@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.pptx_fill import generate_estimation_pptx
+
+
+def _build_template(path: Path) -> None:
+    prs = Presentation()
+    for _ in range(6):
+        prs.slides.add_slide(prs.slide_layouts[6])
+    mask = prs.slides[5].shapes.add_shape(1, Inches(1), Inches(1), Inches(3), Inches(2))
+    mask.name = "ESTIMATION_HISTO_MASK"
+    prs.save(path)
+
+
+def test_chart_inserted_in_single_atomic_save(tmp_path):
+    template_path = tmp_path / "template.pptx"
+    _build_template(template_path)
+    chart_path = tmp_path / "histo.png"
+    Image.new("RGB", (10, 10), color="blue").save(chart_path)
+    output_path = tmp_path / "out" / "estimation.pptx"
+
+    report = generate_estimation_pptx(
+        str(template_path), str(output_path), mapping={}, chart_image=str(chart_path)
+    )
+
+    assert report.ok is True
+    assert sorted(p.name for p in output_path.parent.iterdir()) == ["estimation.pptx"]
+    pictures = [sh for sh in Presentation(output_path).slides[5].shapes if sh.shape_type == 13]
+    assert len(pictures) == 1
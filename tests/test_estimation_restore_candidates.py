@@ -0,0 +1,30 @@
+from app.views import estimation
+from services.wiki_images import ImageCandidate
+
+
+def _candidate(url: str) -> ImageCandidate:
+    return ImageCandidate(url=url, thumb_url=None, width=None, height=None, source="commons")
+
+
+def test_restore_candidates_returns_stored_objects(monkeypatch):
+    stored = [_candidate("https://a"), _candidate("https://b")]
+    state = {"visite1_candidates": stored}
+    monkeypatch.setattr(estimation.st, "session_state", state, raising=False)
+
+    assert estimation._restore_candidates("visite1_candidates") is stored
+
+
+def test_restore_candidates_converts_legacy_dicts_once(monkeypatch):
+    state = {"visite1_candidates": [_candidate("https://a").to_dict()]}
+    monkeypatch.setattr(estimation.st, "session_state", state, raising=False)
+
+    restored = estimation._restore_candidates("visite1_candidates")
+
+    assert restored == [_candidate("https://a")]
+    assert state["visite1_candidates"] is restored
+
+
+def test_restore_candidates_missing_key(monkeypatch):
+    monkeypatch.setattr(estimation.st, "session_state", {}, raising=False)
+
+    assert estimation._restore_candidates("visite2_candidates") == []
@@ -0,0 +1,40 @@
+import json
+
+from app.services import estimation_state_cache
+
+
+def _state():
+    return {
+        "quartier_intro": "Quartier vivant",
+        "transport_metro_texte": "1, 4",
+        "transport_bus_texte": "38",
+        "transport_taxi_texte": "Stations de taxi",
+        "metro_lines_auto": [{"ref": "1"}],
+        "unrelated_widget": True,
+    }
+
+
+def test_state_cache_round_trip_keeps_whitelisted_keys(tmp_path):
+    estimation_state_cache.set_cached_state("10 Rue Test", 500, _state(), base_dir=tmp_path)
+
+    cached = estimation_state_cache.get_cached_state("10  rue test", 500, base_dir=tmp_path)
+
+    assert cached["quartier_intro"] == "Quartier vivant"
+    assert cached["metro_lines_auto"] == [{"ref": "1"}]
+    assert "unrelated_widget" not in cached
+    assert estimation_state_cache.get_cached_state("10 rue test", 800, base_dir=tmp_path) is None
+
+
+def test_state_cache_ignores_expired_and_old_schema(tmp_path, monkeypatch):
+    monkeypatch.setattr(estimation_state_cache.time, "time", lambda: 1000.0)
+    estimation_state_cache.set_cached_state("10 rue test", 500, _state(), base_dir=tmp_path)
+
+    monkeypatch.setattr(estimation_state_cache.time, "time", lambda: 1000.0 + 3600 + 1)
+    assert estimation_state_cache.get_cached_state("10 rue test", 500, base_dir=tmp_path, ttl_seconds=3600) is None
+
+    monkeypatch.setattr(estimation_state_cache.time, "time", lambda: 1000.0)
+    (target,) = tmp_path.glob("*.json")
+    payload = json.loads(target.read_text(encoding="utf-8"))
+    payload["version"] = estimation_state_cache.SCHEMA_VERSION + 1
+    target.write_text(json.dumps(payload), encoding="utf-8")
+    assert estimation_state_cache.get_cached_state("10 rue test", 500, base_dir=tmp_path) is None
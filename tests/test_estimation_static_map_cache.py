@@ -0,0 +1,32 @@
+import os
+
+from app.views import utils
+
+
+def test_static_map_is_cached_on_rounded_coordinates(monkeypatch, tmp_path):
+    calls: list[tuple] = []
+
+    def _fake_build(lat, lon, pixel_radius=60, size=(900, 900)):
+        calls.append((lat, lon))
+        path = tmp_path / f"map-{len(calls)}.png"
+        path.write_bytes(b"png")
+        return str(path)
+
+    monkeypatch.setattr("app.services.map_image.build_static_map", _fake_build)
+    utils._cached_static_map.clear()
+
+    first = utils._static_map_path(48.8566001, 2.3522002)
+    second = utils._static_map_path(48.8566004, 2.3522004)
+    other = utils._static_map_path(45.764, 4.8357)
+    assert first == second
+    assert calls == [(48.8566, 2.3522), (45.764, 4.8357)]
+
+    os.remove(first)
+    rebuilt = utils._static_map_path(48.8566, 2.3522)
+    assert os.path.exists(rebuilt)
+    assert len(calls) == 3
+
+    # Other maps keep their cached file.
+    assert utils._static_map_path(45.764, 4.8357) == other
+    assert len(calls) == 3
+    utils._cached_static_map.clear()
@@ -0,0 +1,33 @@
+import os
+
+from app.services import template_roots
+from app.views import estimation
+
+
+def test_estimation_templates_relisted_only_when_folder_changes(tmp_path, monkeypatch):
+    cd_dir = tmp_path / "estimation" / "cd"
+    cd_dir.mkdir(parents=True)
+    (cd_dir / "a.pptx").touch()
+    monkeypatch.setattr(template_roots, "ESTIMATION_CD_TPL_DIR", cd_dir)
+
+    calls: list[str] = []
+    real_list = estimation.list_repo_estimation_templates
+
+    def _counting_list(estimation_type):
+        calls.append(estimation_type)
+        return real_list(estimation_type)
+
+    monkeypatch.setattr(estimation, "list_repo_estimation_templates", _counting_list)
+    estimation._cached_repo_estimation_templates.clear()
+
+    first = estimation._list_estimation_templates("CD")
+    assert [tpl.label for tpl in first] == ["a.pptx"]
+    assert estimation._list_estimation_templates("CD") == first
+    assert calls == ["CD"]
+
+    (cd_dir / "b.pptx").touch()
+    stat = cd_dir.stat()
+    os.utime(cd_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert [tpl.label for tpl in estimation._list_estimation_templates("CD")] == ["a.pptx", "b.pptx"]
+    assert calls == ["CD", "CD"]
+    estimation._cached_repo_estimation_templates.clear()
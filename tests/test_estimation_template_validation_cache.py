@@ -0,0 +1,23 @@
+from app.services.template_validation import ValidationResult
+from app.views import estimation
+
+
+def test_template_validation_is_cached_until_mtime_changes(monkeypatch):
+    calls: list[str] = []
+
+    def _fake_validate(path, mapping_keys, required_shapes, requirement_detectors=None):
+        calls.append(path)
+        return ValidationResult(ok=True, severity="OK")
+
+    monkeypatch.setattr("app.services.template_validation.validate_pptx_template", _fake_validate)
+    estimation._cached_validate_estimation_template.clear()
+    keys = frozenset({"[[ADRESSE]]"})
+
+    first = estimation._cached_validate_estimation_template("tpl.pptx", 1.0, keys, "CD")
+    estimation._cached_validate_estimation_template("tpl.pptx", 1.0, keys, "CD")
+    assert first.severity == "OK"
+    assert calls == ["tpl.pptx"]
+
+    estimation._cached_validate_estimation_template("tpl.pptx", 2.0, keys, "CD")
+    assert calls == ["tpl.pptx", "tpl.pptx"]
+    estimation._cached_validate_estimation_template.clear()
@@ -0,0 +1,23 @@
+from app.views import estimation
+
+
+def test_transport_caption_format(monkeypatch):
+    captions: list[str] = []
+    monkeypatch.setattr(estimation.st, "caption", captions.append)
+
+    estimation._display_transport_caption(
+        {"duration_ms": 120.7, "items": 3, "status": "ok"},
+        {"duration_ms": 450, "items": 0, "status": "timeout", "mirror": "kumi"},
+        None,
+    )
+
+    assert captions == ["Transports: mirror=kumi | taxi 120ms 3 items | metro 450ms 0 items timeout"]
+
+
+def test_transport_caption_skips_without_debug(monkeypatch):
+    captions: list[str] = []
+    monkeypatch.setattr(estimation.st, "caption", captions.append)
+
+    estimation._display_transport_caption(None, None, None)
+
+    assert captions == []
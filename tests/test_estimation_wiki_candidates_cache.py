@@ -0,0 +1,27 @@
+from services.wiki_images import ImageCandidate
+
+from app.views import estimation
+
+
+class _FakeWikiService:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def candidates(self, title, city, country, limit=5):
+        self.calls.append(title)
+        return [ImageCandidate(url=f"https://img/{title}.jpg", thumb_url=None, width=10, height=10, source="Wikimedia")]
+
+
+def test_wiki_candidates_are_cached_per_title(monkeypatch):
+    service = _FakeWikiService()
+    monkeypatch.setattr(estimation, "_wiki_service", lambda: service)
+    estimation._cached_wiki_candidates.clear()
+
+    first = estimation._cached_wiki_candidates("Louvre", 5)
+    second = estimation._cached_wiki_candidates("Louvre", 5)
+    estimation._cached_wiki_candidates("Orsay", 5)
+
+    assert first == second
+    assert ImageCandidate.from_dict(first[0]).url == "https://img/Louvre.jpg"
+    assert service.calls == ["Louvre", "Orsay"]
+    estimation._cached_wiki_candidates.clear()
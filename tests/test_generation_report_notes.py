@@ -0,0 +1,10 @@
+from app.services.generation_report import GenerationReport
+
+
+def test_add_notes_keeps_order_and_skips_duplicates():
+    report = GenerationReport()
+    report.add_note("Mode MD: histogramme ignoré")
+
+    report.add_notes(["Tokens inconnus", "Mode MD: histogramme ignoré", "Shapes absentes"])
+
+    assert report.notes == ["Mode MD: histogramme ignoré", "Tokens inconnus", "Shapes absentes"]
@@ -0,0 +1,35 @@
+import io
+
+import pytest
+from PIL import Image
+
+from services.image_uploads import save_uploaded_image
+
+
+class _Upload(io.BytesIO):
+    def __init__(self, data: bytes, content_type: str) -> None:
+        super().__init__(data)
+        self.type = content_type
+
+
+def _png_bytes() -> bytes:
+    buf = io.BytesIO()
+    Image.effect_noise((200, 200), 80).convert("RGB").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_save_uploaded_image_streams_from_start(tmp_path):
+    data = _png_bytes()
+    upload = _Upload(data, "image/png")
+    upload.read(10)  # already consumed by a previous preview
+
+    path = save_uploaded_image(upload, prefix="Visite 1", dest_dir=str(tmp_path))
+
+    assert path.endswith(".png")
+    with Image.open(path) as img:
+        assert img.size == (200, 200)
+
+
+def test_save_uploaded_image_rejects_tiny_files(tmp_path):
+    with pytest.raises(ValueError):
+        save_uploaded_image(_Upload(b"x" * 100, "image/png"), prefix="v", dest_dir=str(tmp_path))
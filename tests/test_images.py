@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import io
 import sys
+from collections import OrderedDict
 from pathlib import Path
 from typing import Iterator
 
@@ -39,6 +40,7 @@ def _configure_paths(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     monkeypatch.setattr(image_fetcher, "OUTPUT_DIR", tmp_path)
     monkeypatch.setattr(image_fetcher, "PLACEHOLDER_PATH", tmp_path / "placeholder.png")
     monkeypatch.setattr(image_fetcher, "_sleep", lambda _: None)
+    monkeypatch.setattr(image_fetcher, "_RESULT_CACHE", OrderedDict())
 
 
 def _sequence_responses(responses: Iterator[DummyResponse]):
@@ -179,3 +181,47 @@ def test_retry_on_429(monkeypatch: pytest.MonkeyPatch) -> None:
 def test_slugify_handles_accents() -> None:
     slug = image_fetcher._slugify("Église Saint-Étienne")
     assert slug == "eglise-saint-etienne"
+
+
+def test_placeholder_result_is_memoised(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    _configure_paths(monkeypatch, tmp_path)
+    monkeypatch.delenv("UNSPLASH_ACCESS_KEY", raising=False)
+    monkeypatch.delenv("PEXELS_API_KEY", raising=False)
+    calls: list[str] = []
+
+    def _fake_cascade(poi_name, city, country):
+        calls.append(poi_name)
+        placeholder = image_fetcher._ensure_placeholder()
+        return placeholder, [image_fetcher.ProviderAttempt("placeholder", "", "0", 0.0, local_path=placeholder)]
+
+    monkeypatch.setattr(image_fetcher, "_cascade", _fake_cascade)
+
+    first = image_fetcher.get_poi_image("Lieu sans photo", city="Paris")
+    second = image_fetcher.get_poi_image("Lieu sans photo", city="Paris")
+
+    assert first == second
+    assert calls == ["Lieu sans photo"]
+    assert image_fetcher.get_last_result().provider == "placeholder"
+
+
+def test_result_cache_is_bounded_and_drops_stale_entries(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    _configure_paths(monkeypatch, tmp_path)
+    monkeypatch.setattr(image_fetcher, "RESULT_CACHE_MAX_ENTRIES", 2)
+    calls: list[str] = []
+
+    def _fake_cascade(poi_name, city, country):
+        calls.append(poi_name)
+        path = tmp_path / f"{poi_name}.jpg"
+        path.write_bytes(b"jpg")
+        return str(path), [image_fetcher.ProviderAttempt("wikimedia", "", "200", 0.0, local_path=str(path))]
+
+    monkeypatch.setattr(image_fetcher, "_cascade", _fake_cascade)
+
+    for name in ("a", "b", "c"):
+        image_fetcher.get_poi_image(name)
+    assert [key[0] for key in image_fetcher._RESULT_CACHE] == ["b", "c"]
+
+    (tmp_path / "c.jpg").unlink()
+    image_fetcher.get_poi_image("c")
+    assert calls == ["a", "b", "c", "c"]
+    assert len(image_fetcher._RESULT_CACHE) == 2
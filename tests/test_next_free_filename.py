@@ -0,0 +1,10 @@
+from app.views.utils import _next_free_filename
+
+
+def test_next_free_filename_keeps_unused_name():
+    assert _next_free_filename("estimation.pptx", {"autre.pptx"}) == "estimation.pptx"
+
+
+def test_next_free_filename_skips_taken_suffixes():
+    existing = {"estimation.pptx", "estimation (2).pptx", "estimation (3).pptx"}
+    assert _next_free_filename("estimation.pptx", existing) == "estimation (4).pptx"
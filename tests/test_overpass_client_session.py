@@ -0,0 +1,41 @@
+from app.services import overpass_client
+
+
+class _Response:
+    def __init__(self, status_code=200, text="", payload=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = text
+        self._payload = payload or {}
+
+    def json(self):
+        return self._payload
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+
+    def get(self, url, timeout=None):
+        self.calls.append(("GET", url))
+        return _Response(text="Slots available: 2")
+
+    def post(self, url, data=None, timeout=None):
+        self.calls.append(("POST", url))
+        return _Response(payload={"elements": [{"id": 1}]})
+
+
+def test_query_overpass_reuses_shared_session(monkeypatch):
+    session = _RecordingSession()
+    monkeypatch.setattr(overpass_client, "_SESSION", session)
+
+    elements, debug = overpass_client.query_overpass("[out:json];", "test")
+
+    assert elements == [{"id": 1}]
+    assert debug["status"] == "ok"
+    first = overpass_client.OVERPASS_ENDPOINTS[0]
+    assert session.calls == [("GET", first.replace("interpreter", "status")), ("POST", first)]
+
+
+def test_shared_session_sends_default_headers():
+    assert overpass_client._SESSION.headers["User-Agent"] == overpass_client._HEADERS["User-Agent"]
@@ -38,3 +38,68 @@ def test_poi_fallback_to_geoapify(monkeypatch):
     assert results["incontournables"]
     assert results["incontournables"][0].name == "Geo Spot"
     assert any("Fallback POI utilisé" in warn or "Google Places non disponible" in warn for warn in report.provider_warnings)
+
+
+class DummyGoogle:
+    def __init__(self, api_key=None):
+        self.api_key = api_key
+
+    def _place(self, name):
+        return type("Obj", (), {"name": name, "distance_m": 5.0})
+
+    def list_incontournables(self, lat, lon, radius_m):
+        return [self._place("Incontournable")]
+
+    def list_spots(self, lat, lon, radius_m):
+        return [self._place("Spot")]
+
+    def list_visits(self, lat, lon, radius_m):
+        raise RuntimeError("quota dépassé")
+
+
+def test_google_categories_loaded_in_parallel_keep_order():
+    results = poi_facade._map_google(DummyGoogle(), 1.0, 2.0, 500, ["spots", "incontournables"])
+
+    assert list(results) == ["spots", "incontournables"]
+    assert results["spots"][0].name == "Spot"
+    assert results["incontournables"][0].provider == "Google Places"
+
+
+def test_google_category_error_falls_back(monkeypatch):
+    monkeypatch.setattr(
+        poi_facade,
+        "get_provider_status",
+        lambda: {
+            "Google Places": {"enabled": True},
+            "Geoapify": {"enabled": True},
+        },
+    )
+    monkeypatch.setattr(poi_facade, "resolve_google_key", lambda: ("token", "env"))
+    monkeypatch.setattr(poi_facade, "GooglePlacesService", DummyGoogle)
+    poi_facade._google_service.cache_clear()
+    monkeypatch.setattr(poi_facade, "resolve_geoapify_key", lambda: ("token", "env"))
+    monkeypatch.setattr(poi_facade, "GeoapifyPlacesService", DummyGeoapify)
+
+    report = GenerationReport()
+    results = poi_facade.get_pois(1.0, 2.0, 500, ("incontournables", "visits"), report=report)
+
+    assert results["incontournables"][0].name == "Geo Spot"
+    assert any("quota dépassé" in warn for warn in report.provider_warnings)
+    poi_facade._google_service.cache_clear()
+
+
+def test_google_service_reused_per_key(monkeypatch):
+    monkeypatch.setattr(poi_facade, "GooglePlacesService", DummyGoogle)
+    poi_facade._google_service.cache_clear()
+
+    first = poi_facade._google_service("token")
+    assert poi_facade._google_service("token") is first
+    assert poi_facade._google_service("other") is not first
+    poi_facade._google_service.cache_clear()
+
+
+def test_geoapify_categories_loaded_in_parallel_keep_order():
+    results = poi_facade._map_geoapify(DummyGeoapify(), 1.0, 2.0, 500, ["spots", "visits", "incontournables"])
+
+    assert list(results) == ["spots", "incontournables"]
+    assert results["incontournables"][0].provider == "Geoapify"
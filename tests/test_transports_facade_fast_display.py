@@ -38,17 +38,20 @@ def test_fast_mode_labels_without_ligne(monkeypatch):
 
 
 def test_overpass_limit_to_four_items(monkeypatch):
+    queries: list[str] = []
+
     def fake_query_overpass(query):
-        is_bus = "bus_stop" in query
+        queries.append(query)
         elements = []
-        for i in range(100):
-            elements.append(
-                {
-                    "lat": 48.0 + 0.0001 * i,
-                    "lon": 2.0,
-                    "tags": {"name": f"{'Bus' if is_bus else 'Station'} {i}", "highway": "bus_stop" if is_bus else "railway"},
-                }
-            )
+        for is_bus in (False, True):
+            for i in range(100):
+                elements.append(
+                    {
+                        "lat": 48.0 + 0.0001 * i,
+                        "lon": 2.0,
+                        "tags": {"name": f"Bus {i}", "highway": "bus_stop"} if is_bus else {"name": f"Station {i}", "railway": "station"},
+                    }
+                )
         return elements, {"status": "ok", "items": len(elements)}
 
     monkeypatch.setattr(facade, "_query_overpass_points", fake_query_overpass)
@@ -59,3 +62,61 @@ def test_overpass_limit_to_four_items(monkeypatch):
 
     assert len(result["metro_lines"]) == facade._MAX_RESULTS
     assert len(result["bus_lines"]) == facade._MAX_RESULTS
+    assert all(line.startswith("Station Station") for line in result["metro_lines"])
+    assert all(line.startswith("Arrêt Bus") for line in result["bus_lines"])
+    # Stations and bus stops come from a single Overpass round-trip.
+    assert len(queries) == 1
+
+
+def test_finalize_entries_stops_after_max_results(monkeypatch):
+    calls: list[str] = []
+    real_normalize = facade.normalize_name
+
+    def _counting_normalize(name):
+        calls.append(name)
+        return real_normalize(name)
+
+    monkeypatch.setattr(facade, "normalize_name", _counting_normalize)
+    candidates = [{"name": f"Gare {i}", "distance_m": float(i)} for i in range(50, 0, -1)]
+
+    labels = facade._finalize_entries(candidates, prefix="Station")
+
+    assert labels == [f"Station Gare {i} ({i} m)" for i in range(1, facade._MAX_RESULTS + 1)]
+    # One normalization for the empty-name check and one for the dedupe, per kept label.
+    assert len(calls) == 2 * facade._MAX_RESULTS
+
+
+def test_element_in_both_sets_is_listed_as_station_and_bus_stop(monkeypatch):
+    shared = {"type": "node", "id": 1, "lat": 48.0, "lon": 2.0, "tags": {"name": "Gare Centre", "public_transport": "station", "highway": "bus_stop"}}
+    # Overpass prints the element once for .stations and once for .bus.
+    monkeypatch.setattr(facade, "_query_overpass_points", lambda query: ([shared, dict(shared)], {"status": "ok"}))
+
+    data = facade._fetch_overpass_data(48.0, 2.0, 500)
+
+    assert data["metro_lines"] == ["Station Gare Centre (0 m)"]
+    assert data["bus_lines"] == ["Arrêt Gare Centre (0 m)"]
+    assert data["raw_counts"] == {"metro": 1, "bus": 1}
+
+
+def test_failed_combined_query_falls_back_to_separate_queries(monkeypatch):
+    queries: list[str] = []
+
+    def fake_query_overpass(query):
+        queries.append(query)
+        if "->.bus" in query:
+            return [], {"status": "timeout"}
+        if "highway=bus_stop" in query:
+            return [], {"status": "error", "error": "http_429"}
+        return [{"lat": 48.0, "lon": 2.0, "tags": {"name": "Alpha", "railway": "station"}}], {"status": "ok"}
+
+    monkeypatch.setattr(facade, "_query_overpass_points", fake_query_overpass)
+
+    data = facade._fetch_overpass_data(48.0, 2.0, 500)
+
+    assert len(queries) == 3
+    assert data["metro_lines"] == ["Station Alpha (0 m)"]
+    assert data["bus_lines"] == []
+    assert data["warnings"] == ["Overpass indisponible (timeout ou 429) pour les arrêts de bus"]
+    assert data["debug"]["combined"]["status"] == "timeout"
+    assert data["debug"]["metro"]["status"] == "ok"
+    assert data["debug"]["bus"]["error"] == "http_429"